@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from weather_weaver.inputs.ecmwf.arco.fetcher import ECMWFARCOFetcher
+from weather_weaver.inputs.ecmwf.cds.request import DatasetName, ECMWFCDSRequest, ProductType
+from weather_weaver.models.geo import BoundingBox
+
+
+@pytest.fixture
+def store():
+    time = pd.date_range("2021-12-31", "2022-01-02 23:00", freq="h")
+    # ARCO layout: descending latitudes, longitudes in [0, 360)
+    latitude = np.arange(90.0, -91.0, -30.0)
+    longitude = np.arange(0.0, 360.0, 30.0)
+    # each value is the (original) longitude of its grid cell
+    values = np.broadcast_to(longitude, (time.size, latitude.size, longitude.size))
+    dims = ("time", "latitude", "longitude")
+    return xr.Dataset(
+        {
+            "2m_temperature": (dims, values),
+            "total_precipitation": (dims, values),
+            "10m_u_component_of_wind": (dims, values),
+        },
+        coords={"time": time, "latitude": latitude, "longitude": longitude},
+    )
+
+
+@pytest.fixture
+def cds_request():
+    return ECMWFCDSRequest(
+        dataset=DatasetName.ERA5_SINGLE_LEVELS,
+        years=("2022",),
+        months=("01",),
+        days=("01",),
+        times=("00:00", "12:00"),
+        nwp_parameters=("2m_temperature", "total_precipitation"),
+        product_type=ProductType.REANALYSIS,
+        area=BoundingBox(north=60, west=-60, south=0, east=60),
+    )
+
+
+class TestECMWFARCOFetcher:
+    # Select the request times and area, with longitudes wrapped to [-180, 180)
+    def test_select(self, store, cds_request):
+        # Act - Call the method under test
+        result = ECMWFARCOFetcher.select(store, cds_request)
+
+        # Assert - Check if the expected results are obtained
+        np.testing.assert_array_equal(
+            result["valid_time"].values,
+            pd.to_datetime(["2022-01-01 00:00", "2022-01-01 12:00"]).values,
+        )
+        np.testing.assert_array_equal(result["latitude"].values, [60.0, 30.0, 0.0])
+        np.testing.assert_array_equal(result["longitude"].values, [-60.0, -30.0, 0.0, 30.0, 60.0])
+        # data is moved along with the wrapped longitudes
+        np.testing.assert_array_equal(
+            result["t2m"].isel(valid_time=0, latitude=0).values,
+            [300.0, 330.0, 0.0, 30.0, 60.0],
+        )
+
+    # Only the requested variables are kept, renamed to their GRIB short names
+    def test_select_renames_requested_variables(self, store, cds_request):
+        # Act - Call the method under test
+        result = ECMWFARCOFetcher.select(store, cds_request)
+
+        # Assert - Check if the expected results are obtained
+        assert set(result.data_vars) == {"t2m", "tp"}
+        assert "time" not in result.dims
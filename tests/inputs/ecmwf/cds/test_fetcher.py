@@ -0,0 +1,34 @@
+import pickle
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("cdsapi")
+
+from weather_weaver.inputs.ecmwf.cds.fetcher import ECMWFCDSFetcher
+
+
+@pytest.fixture
+def fetcher(mocker):
+    mocker.patch("weather_weaver.inputs.ecmwf.cds.fetcher.cdsapi.Client")
+    fetcher = ECMWFCDSFetcher()
+    # picklable stand-in for the CDS client
+    fetcher.client = SimpleNamespace()
+    return fetcher
+
+
+class TestECMWFCDSFetcher:
+    # The fetcher is pickled without its lock and raw file listings
+    def test_pickle_round_trip(self, fetcher, tmp_path):
+        # Arrange - Set up inputs and expected outputs
+        fetcher._set_raw_file_size(tmp_path / "file.grib", 10)
+
+        # Act - Call the method under test
+        unpickled = pickle.loads(pickle.dumps(fetcher))  # noqa: S301
+
+        # Assert - Check if the expected results are obtained
+        assert unpickled._raw_file_sizes == {}
+        assert unpickled._raw_file_sizes_lock is not fetcher._raw_file_sizes_lock
+        assert fetcher._raw_file_sizes == {tmp_path: {"file.grib": 10}}
+        unpickled._set_raw_file_size(tmp_path / "other.grib", 5)
+        assert unpickled._raw_file_sizes == {tmp_path: {"other.grib": 5}}
@@ -0,0 +1,199 @@
+import io
+import pickle
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+pytest.importorskip("ecmwf.opendata")
+
+from weather_weaver.inputs.ecmwf.open_data import constants
+from weather_weaver.inputs.ecmwf.open_data.fetcher import (
+    ECMWFOpenDataFetcher,
+    _is_complete_grib,
+    _merge_parts,
+)
+
+
+class MockResponse:
+    def __init__(self, status_code: int, chunks: list[bytes], error: Exception | None = None):
+        self.status_code = status_code
+        self.chunks = chunks
+        self.error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        return None
+
+    def iter_content(self, chunk_size: int):  # noqa: ARG002
+        yield from self.chunks
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture
+def fetcher(mocker):
+    mocker.patch("weather_weaver.inputs.ecmwf.open_data.fetcher.ECMWFClient")
+    mocker.patch("weather_weaver.inputs.ecmwf.open_data.fetcher.time.sleep")
+    fetcher = ECMWFOpenDataFetcher()
+    fetcher.session = mocker.Mock()
+    return fetcher
+
+
+class MockClient:
+    def _get_urls(self, **kwargs):  # noqa: ARG002
+        return SimpleNamespace(urls=[])
+
+
+def make_request(run_time: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        run_date="2024-01-01",
+        run_time=run_time,
+        stream="oper",
+        request_type="fc",
+        nwp_parameters=("2t",),
+        forecast_steps=(0,),
+        to_ecmwf_request=dict,
+    )
+
+
+class TestMergeParts:
+    # Contiguous byte ranges are merged, regardless of their order
+    def test_merge_parts(self):
+        # Arrange - Set up inputs and expected outputs
+        parts = [(20, 5), (0, 10), (10, 5), (30, 5)]
+        expected = [(0, 15), (20, 5), (30, 5)]
+
+        # Act - Call the function under test
+        result = _merge_parts(parts)
+
+        # Assert - Check if the expected results are obtained
+        assert result == expected
+
+
+class TestIsCompleteGrib:
+    # Only files above the min size and ending with the end section are complete
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            (b"GRIB" + b"0" * 16 + b"7777", True),
+            (b"GRIB" + b"0" * 16 + b"77", False),
+            (b"GRIB7777", False),
+        ],
+    )
+    def test_is_complete_grib(self, tmp_path, content, expected):
+        # Arrange - Set up inputs and expected outputs
+        path = tmp_path / "file.grib2"
+        path.write_bytes(content)
+
+        # Act - Call the function under test
+        result = _is_complete_grib(path, min_size_bytes=10)
+
+        # Assert - Check if the expected results are obtained
+        assert result is expected
+
+    # Missing files are not complete
+    def test_is_complete_grib_missing_file(self, tmp_path):
+        # Act - Call the function under test
+        result = _is_complete_grib(tmp_path / "missing.grib2", min_size_bytes=0)
+
+        # Assert - Check if the expected results are obtained
+        assert result is False
+
+
+class TestDownloadRange:
+    # Interrupted range downloads resume from the last byte written
+    def test_download_range_resumes(self, fetcher):
+        # Arrange - Set up inputs and expected outputs
+        fetcher.session.get.side_effect = [
+            MockResponse(
+                requests.codes.partial_content,
+                [b"0123"],
+                error=requests.ConnectionError("interrupted"),
+            ),
+            MockResponse(requests.codes.partial_content, [b"456789"]),
+        ]
+        f = io.BytesIO()
+
+        # Act - Call the method under test
+        fetcher._download_range("https://test/file", (100, 10), f)
+
+        # Assert - Check if the expected results are obtained
+        assert f.getvalue() == b"0123456789"
+        ranges = [call.kwargs["headers"]["Range"] for call in fetcher.session.get.call_args_list]
+        assert ranges == ["bytes=100-109", "bytes=104-109"]
+
+    # A byte range answered with the whole object (no 206) is an error
+    def test_download_range_ignored_range(self, fetcher):
+        # Arrange - Set up inputs and expected outputs
+        fetcher.session.get.return_value = MockResponse(requests.codes.ok, [b"whole file"])
+        f = io.BytesIO()
+
+        # Act & Assert - Check the error is raised
+        with pytest.raises(ValueError, match="Range request ignored"):
+            fetcher._download_range("https://test/file", (100, 10), f)
+        assert f.getvalue() == b""
+
+    # Resuming a whole file restarts from scratch if the server ignores the range
+    def test_download_range_whole_file_restarts(self, fetcher):
+        # Arrange - Set up inputs and expected outputs
+        fetcher.session.get.side_effect = [
+            MockResponse(
+                requests.codes.ok,
+                [b"abc"],
+                error=requests.ConnectionError("interrupted"),
+            ),
+            MockResponse(requests.codes.ok, [b"abcdef"]),
+        ]
+        f = io.BytesIO(b"header")
+        f.seek(0, io.SEEK_END)
+
+        # Act - Call the method under test
+        fetcher._download_range("https://test/file", None, f)
+
+        # Assert - Check if the expected results are obtained
+        assert f.getvalue() == b"headerabcdef"
+        headers = [call.kwargs["headers"] for call in fetcher.session.get.call_args_list]
+        assert headers == [{}, {"Range": "bytes=3-"}]
+
+
+class TestListRawFiles:
+    # Listings are cached, the least recently used one is evicted first
+    def test_list_raw_files_lru(self, mocker, fetcher):
+        # Arrange - Set up inputs and expected outputs
+        mocker.patch.object(constants, "URLS_CACHE_MAXSIZE", 2)
+        fetcher.client._get_urls.side_effect = lambda **_: SimpleNamespace(urls=[object()])
+        requests_ = [make_request(run_time) for run_time in (0, 6, 12)]
+
+        # Act - Call the method under test
+        first_urls = fetcher.list_raw_files(requests_[0])
+        fetcher.list_raw_files(requests_[1])
+        # most recently used, kept over run time 6
+        fetcher.list_raw_files(requests_[0])
+        fetcher.list_raw_files(requests_[2])
+
+        # Assert - Check if the expected results are obtained
+        assert fetcher.client._get_urls.call_count == 3
+        assert [key[1] for key in fetcher._urls_cache] == [0, 12]
+        assert fetcher.list_raw_files(requests_[0]) is first_urls
+
+    # The fetcher is pickled without its lock and cached listings
+    def test_pickle_round_trip(self, fetcher):
+        # Arrange - Set up inputs and expected outputs
+        # picklable stand-ins for the ECMWF client and http session
+        fetcher.client = MockClient()
+        fetcher.session = SimpleNamespace()
+        fetcher.list_raw_files(make_request(0))
+
+        # Act - Call the method under test
+        unpickled = pickle.loads(pickle.dumps(fetcher))  # noqa: S301
+
+        # Assert - Check if the expected results are obtained
+        assert len(fetcher._urls_cache) == 1
+        assert len(unpickled._urls_cache) == 0
+        assert unpickled._urls_cache_lock is not fetcher._urls_cache_lock
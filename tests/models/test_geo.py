@@ -0,0 +1,134 @@
+import dask_geopandas as dask_gpd
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+import urllib3
+import xarray as xr
+
+from weather_weaver.models.geo import BoundingBox, GeoFilterModel, download_world_countries
+
+
+@pytest.fixture
+def filter_df():
+    return gpd.GeoDataFrame(
+        {
+            "country_name": ["France", "Germany", "Switzerland"],
+            "country_iso3": ["FRA", "DEU", "CHE"],
+        },
+        geometry=[
+            shapely.box(-5, 42, 6, 51),
+            shapely.box(6, 47, 15, 55),
+            shapely.box(6, 45.8, 10.5, 47),
+        ],
+        crs=4326,
+        index=[10, 20, 30],
+    )
+
+
+@pytest.fixture
+def points_gdf():
+    rng = np.random.default_rng(0)
+    n_points = 1_000
+    df = pd.DataFrame(
+        {
+            "latitude": rng.uniform(40, 57, n_points),
+            "longitude": rng.uniform(-6, 16, n_points),
+            "value": np.arange(n_points, dtype="float64"),
+        },
+    )
+    return gpd.GeoDataFrame(
+        df,
+        geometry=gpd.points_from_xy(df["longitude"], df["latitude"]),
+        crs=4326,
+    )
+
+
+class TestGeoFilterModel:
+    # Filter dask dataframe matches a geopandas spatial join
+    def test_filter_dask_matches_sjoin(self, filter_df, points_gdf):
+        # Arrange - Set up inputs and expected outputs
+        geo_filter = GeoFilterModel(filter_df=filter_df, method="within")
+        ddf = dask_gpd.from_geopandas(points_gdf, npartitions=3)
+        expected = gpd.sjoin(points_gdf, filter_df, predicate="within")
+
+        # Act - Call the method under test
+        result = geo_filter.filter_dask(ddf).compute()
+
+        # Assert - Check if the expected results are obtained
+        assert list(result.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(result.drop(columns="geometry")).sort_values(["value", "index_right"]),
+            pd.DataFrame(expected.drop(columns="geometry")).sort_values(["value", "index_right"]),
+        )
+
+    # Tag dataset grid cells like a spatial join on the flattened points
+    def test_tag_dataset_matches_sjoin(self, filter_df):
+        # Arrange - Set up inputs and expected outputs
+        geo_filter = GeoFilterModel(filter_df=filter_df, method="within")
+        latitude = np.arange(56.0, 40.0, -0.5)
+        longitude = np.arange(-6.0, 16.0, 0.5)
+        dataset = xr.Dataset(
+            {"t2m": (("latitude", "longitude"), np.ones((latitude.size, longitude.size)))},
+            coords={"latitude": latitude, "longitude": longitude},
+        )
+        df = dataset.to_dataframe().reset_index()
+        points = gpd.GeoDataFrame(
+            df,
+            geometry=gpd.points_from_xy(df["longitude"], df["latitude"]),
+            crs=4326,
+        )
+        expected = gpd.sjoin(points, filter_df, predicate="within")
+
+        # Act - Call the method under test
+        result = geo_filter.tag_dataset(dataset).to_dataframe().reset_index()
+
+        # Assert - Check if the expected results are obtained
+        assert geo_filter.tag_columns == ["country_name", "country_iso3"]
+        result = result.dropna(subset=geo_filter.tag_columns)
+        pd.testing.assert_frame_equal(
+            result[["latitude", "longitude", "country_iso3"]].reset_index(drop=True),
+            pd.DataFrame(expected[["latitude", "longitude", "country_iso3"]]).reset_index(
+                drop=True,
+            ),
+        )
+
+
+class TestBoundingBox:
+    # Parse a bounding box string, with loose whitespace
+    @pytest.mark.parametrize(
+        "value",
+        ["N: 73.5 W: -27 S: 33 E: 45", "  N:73.5  W:-27 S:33   E:45 "],
+    )
+    def test_from_str(self, value):
+        # Act - Call the method under test
+        result = BoundingBox.from_str(value)
+
+        # Assert - Check if the expected results are obtained
+        assert (result.north, result.west, result.south, result.east) == (73.5, -27, 33, 45)
+
+    # Malformed strings are rejected
+    @pytest.mark.parametrize(
+        "value",
+        ["N: 73.5 W: -27 S: 33", "W: -27 N: 73.5 S: 33 E: 45", "N: 73.5 W: -27 S: 33 E: 45 X"],
+    )
+    def test_from_str_invalid(self, value):
+        # Act & Assert - Check the error is raised
+        with pytest.raises(ValueError, match="Invalid bounding box"):
+            BoundingBox.from_str(value)
+
+
+class TestDownloadWorldCountries:
+    # Errors raised mid-stream by urllib3 are wrapped, leaving no partial file behind
+    def test_download_world_countries_interrupted(self, mocker, tmp_path):
+        # Arrange - Set up inputs and expected outputs
+        session_mock = mocker.patch("weather_weaver.models.geo.requests.Session").return_value
+        response = session_mock.get.return_value.__enter__.return_value
+        response.raw.read.side_effect = [b"0" * 10, urllib3.exceptions.ProtocolError("reset")]
+        output_path = tmp_path / "countries.zip"
+
+        # Act & Assert - Check the error is raised
+        with pytest.raises(ValueError, match="Failed downloading countries boundaries"):
+            download_world_countries(output_path)
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,81 @@
+import os
+
+import dask.dataframe as dd
+import pandas as pd
+import pytest
+
+from weather_weaver.outputs.localfs.client import LocalClient, _dir_size
+
+
+@pytest.fixture
+def folder(tmp_path):
+    (tmp_path / "a.parquet").mkdir()
+    (tmp_path / "a.parquet" / "part.0.parquet").write_bytes(b"0" * 10)
+    (tmp_path / "a.parquet" / "nested").mkdir()
+    (tmp_path / "a.parquet" / "nested" / "part.1.parquet").write_bytes(b"0" * 5)
+    (tmp_path / "b.parquet").write_bytes(b"0" * 3)
+    (tmp_path / "c.csv").write_bytes(b"0" * 7)
+    return tmp_path
+
+
+class TestDirSize:
+    # Size of all the files below a directory, nested ones included
+    def test_dir_size(self, folder):
+        # Act - Call the function under test
+        result = _dir_size(os.fspath(folder / "a.parquet"))
+
+        # Assert - Check if the expected results are obtained
+        assert result == 15
+
+    # The walk stops as soon as the threshold is exceeded
+    def test_dir_size_stop_above(self, folder):
+        # Act - Call the function under test
+        result = _dir_size(os.fspath(folder / "a.parquet"), stop_above=1)
+
+        # Assert - Check if the expected results are obtained
+        assert 1 < result < 15
+
+
+class TestLocalClient:
+    # Snapshot sizes of the folder entries, filtered by extension
+    def test_snapshot_sizes(self, folder):
+        # Arrange - Set up inputs and expected outputs
+        client = LocalClient()
+
+        # Act - Call the method under test
+        result = client.snapshot_sizes(folder=folder, extension="parquet")
+
+        # Assert - Check if the expected results are obtained
+        assert result == {"a.parquet": 15, "b.parquet": 3}
+        assert client.snapshot_sizes(folder=folder)["c.csv"] == 7
+        assert client.snapshot_sizes(folder=folder / "missing") == {}
+
+    # A single partition is written directly as part.0.parquet
+    def test_store_single_partition(self, tmp_path):
+        # Arrange - Set up inputs and expected outputs
+        client = LocalClient()
+        df = pd.DataFrame({"latitude": [1.0, 2.0], "t2m": [280.0, 285.0]})
+        ddf = dd.from_pandas(df, npartitions=1)
+        destination_path = tmp_path / "out" / "file.parquet"
+
+        # Act - Call the method under test
+        result = client.store(ddf=ddf, destination_path=destination_path)
+
+        # Assert - Check if the expected results are obtained
+        assert result == destination_path
+        assert os.listdir(destination_path) == ["part.0.parquet"]
+        pd.testing.assert_frame_equal(pd.read_parquet(destination_path), df)
+
+    # Files and directories are deleted, missing paths raise
+    def test_delete(self, folder):
+        # Arrange - Set up inputs and expected outputs
+        client = LocalClient()
+
+        # Act - Call the method under test
+        client.delete(path=folder / "a.parquet")
+        client.delete(path=folder / "b.parquet")
+
+        # Assert - Check if the expected results are obtained
+        assert os.listdir(folder) == ["c.csv"]
+        with pytest.raises(FileNotFoundError, match="file does not exist"):
+            client.delete(path=folder / "b.parquet")
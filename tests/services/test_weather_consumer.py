@@ -1,10 +1,15 @@
 import datetime as dt
+import pickle
+import threading
 from pathlib import Path
+from types import SimpleNamespace
 
 import dask.dataframe as da
 import geopandas as gpd
 import pytest
 
+from weather_weaver.constants import MIN_VALID_SIZE_BYTES
+from weather_weaver.outputs.localfs.client import LocalClient
 from weather_weaver.services.service import WeatherConsumerService
 from weather_weaver.utils import OffsetFrequency
 
@@ -53,7 +58,7 @@ def storer_mock(mocker):
 
     storer_mock = mocker.Mock()
     storer_mock.store.side_effect = mock_store
-    storer_mock.is_valid.return_value = False
+    storer_mock.snapshot_sizes.return_value = {}
     return storer_mock
 
 
@@ -87,7 +92,7 @@ class TestWeatherConsumerService:
         request_builder_mock.build_default_requests.return_value = expected_requests
 
         # Invoke the method under test
-        requests = service._build_default_requests(start, date_offset, offset_frequency)
+        requests = list(service._build_default_requests(start, date_offset, offset_frequency))
 
         # Assert the output
         assert requests == expected_requests
@@ -134,8 +139,9 @@ class TestWeatherConsumerService:
         service.request_builder.build_default_requests.assert_called_once_with(
             run_date=start,
         )
-        service.storer.is_valid.assert_called_once_with(
-            path=Path(f"processed_dir/{mock_request_1.file_name}.parquet"),
+        service.storer.snapshot_sizes.assert_called_once_with(
+            folder=Path("processed_dir"),
+            extension="parquet",
         )
         service.fetcher.download_raw_file.assert_called_once_with(
             raw_dir=Path("raw_dir"),
@@ -149,3 +155,164 @@ class TestWeatherConsumerService:
             ddf=mocker.ANY,
             destination_path=Path(f"processed_dir/{mock_request_1.file_name}.parquet"),
         )
+
+    # Failed downloads are not processed
+    def test_download_datasets_skips_failed_downloads(
+        self,
+        request_builder_mock,
+        fetcher_mock,
+        processor_mock,
+        storer_mock,
+    ):
+        # Arrange - Set up inputs and expected outputs
+        service = WeatherConsumerService(
+            request_builder=request_builder_mock,
+            fetcher=fetcher_mock,
+            raw_dir=Path("raw_dir"),
+            processor=processor_mock,
+            storer=storer_mock,
+            processed_dir=Path("processed_dir"),
+        )
+        fetcher_mock.download_raw_file.side_effect = None
+        fetcher_mock.download_raw_file.return_value = None
+
+        # Act - Call the method under test
+        processed_files = service.download_datasets(
+            dt.date(2022, 1, 1),
+            2,
+            OffsetFrequency.DAILY,
+            scheduler="synchronous",
+        )
+
+        # Assert - Check if the expected results are obtained
+        assert processed_files == []
+        assert service.fetcher.download_raw_file.call_count == 2
+        service.processor.transform.assert_not_called()
+        service.storer.store.assert_not_called()
+
+    # Requests already processed are skipped
+    def test_filter_new_requests(
+        self,
+        request_builder_mock,
+        fetcher_mock,
+        processor_mock,
+        storer_mock,
+    ):
+        # Arrange - Set up inputs and expected outputs
+        service = WeatherConsumerService(
+            request_builder=request_builder_mock,
+            fetcher=fetcher_mock,
+            raw_dir=Path("raw_dir"),
+            processor=processor_mock,
+            storer=storer_mock,
+            processed_dir=Path("processed_dir"),
+        )
+        processed_request = MockRequest(dt.date(2022, 1, 1))
+        new_request = MockRequest(dt.date(2022, 1, 2))
+        empty_request = MockRequest(dt.date(2022, 1, 3))
+        storer_mock.snapshot_sizes.return_value = {
+            f"{processed_request.file_name}.parquet": 10 * MIN_VALID_SIZE_BYTES,
+            f"{empty_request.file_name}.parquet": 0,
+        }
+
+        # Act - Call the method under test
+        new_requests = service._filter_new_requests(
+            [processed_request, new_request, empty_request],
+        )
+
+        # Assert - Check if the expected results are obtained
+        assert new_requests == [new_request, empty_request]
+
+    # Processed files in sub-folders of the processed dir are found
+    def test_filter_new_requests_nested_file_names(
+        self,
+        tmp_path,
+        request_builder_mock,
+        fetcher_mock,
+        processor_mock,
+    ):
+        # Arrange - Set up inputs and expected outputs
+        service = WeatherConsumerService(
+            request_builder=request_builder_mock,
+            fetcher=fetcher_mock,
+            raw_dir=tmp_path / "raw_dir",
+            processor=processor_mock,
+            storer=LocalClient(),
+            processed_dir=tmp_path / "processed_dir",
+        )
+        processed_request = SimpleNamespace(file_name="oper/20220101")
+        new_request = SimpleNamespace(file_name="oper/20220102")
+        other_folder_request = SimpleNamespace(file_name="enfo/20220101")
+        processed_path = tmp_path / "processed_dir" / "oper" / "20220101.parquet"
+        processed_path.mkdir(parents=True)
+        (processed_path / "part.0.parquet").write_bytes(b"0" * (int(MIN_VALID_SIZE_BYTES) + 1))
+
+        # Act - Call the method under test
+        new_requests = service._filter_new_requests(
+            [processed_request, new_request, other_folder_request],
+        )
+
+        # Assert - Check if the expected results are obtained
+        assert new_requests == [new_request, other_folder_request]
+
+    # The dask client is not sent along with the service
+    def test_pickle_drops_client(self):
+        # Arrange - Set up inputs and expected outputs
+        # picklable collaborators, and a client that can't be pickled
+        service = WeatherConsumerService(
+            request_builder=SimpleNamespace(geo_filter=None),
+            fetcher=SimpleNamespace(),
+            raw_dir=Path("raw_dir"),
+            processor=SimpleNamespace(),
+            storer=SimpleNamespace(),
+            processed_dir=Path("processed_dir"),
+            client=threading.Lock(),
+        )
+
+        # Act - Call the method under test
+        unpickled = pickle.loads(pickle.dumps(service))  # noqa: S301
+
+        # Assert - Check if the expected results are obtained
+        assert unpickled.client is None
+        assert unpickled.processed_dir == Path("processed_dir")
+        assert service.client is not None
+
+    # With a client, the service is broadcast to the workers once
+    def test_download_datasets_scatters_service(
+        self,
+        mocker,
+        request_builder_mock,
+        fetcher_mock,
+        processor_mock,
+        storer_mock,
+    ):
+        # Arrange - Set up inputs and expected outputs
+        client_mock = mocker.Mock()
+        # the "future" of the scattered service is the service itself here
+        client_mock.scatter.side_effect = lambda obj, broadcast: obj  # noqa: ARG005
+        client_mock.scheduler_info.return_value = {"workers": {}}
+        service = WeatherConsumerService(
+            request_builder=request_builder_mock,
+            fetcher=fetcher_mock,
+            raw_dir=Path("raw_dir"),
+            processor=processor_mock,
+            storer=storer_mock,
+            processed_dir=Path("processed_dir"),
+            client=client_mock,
+        )
+        start = dt.date(2022, 1, 1)
+
+        # Act - Call the method under test
+        processed_files = service.download_datasets(
+            start,
+            2,
+            OffsetFrequency.DAILY,
+            scheduler="synchronous",
+        )
+
+        # Assert - Check if the expected results are obtained
+        assert processed_files == [
+            Path("processed_dir/20220101.parquet"),
+            Path("processed_dir/20220102.parquet"),
+        ]
+        client_mock.scatter.assert_called_once_with(service, broadcast=True)
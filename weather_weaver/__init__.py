@@ -4,8 +4,31 @@
 # https://github.com/dask/dask/issues/9072
 # https://github.com/dask/distributed/issues/4508
 
-# Current workaround is to call monkey patching function from the msgpack_numpy package
-import msgpack  # noqa: F401
-import msgpack_numpy as m
+# Current workaround is to let distributed's msgpack pack numpy objects as an ExtType.
+# Unlike the msgpack_numpy monkey patch, only numpy objects go through the hooks,
+# instead of every dict of every message.
+import pickle
 
-m.patch()
+import msgpack
+import numpy as np
+from distributed.protocol import core, utils
+
+NUMPY_EXT_TYPE = 42
+
+_msgpack_encode_default = core.msgpack_encode_default
+
+
+def _encode_default(obj):  # noqa: ANN001, ANN202
+    if isinstance(obj, np.ndarray | np.generic):
+        return msgpack.ExtType(NUMPY_EXT_TYPE, pickle.dumps(obj, protocol=5))
+    return _msgpack_encode_default(obj)
+
+
+def _decode_ext(code: int, data: bytes):  # noqa: ANN202
+    if code == NUMPY_EXT_TYPE:
+        return pickle.loads(data)  # noqa: S301
+    return msgpack.ExtType(code, data)
+
+
+core.msgpack_encode_default = _encode_default
+utils.msgpack_opts["ext_hook"] = _decode_ext
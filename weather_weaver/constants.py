@@ -1,44 +1,60 @@
 # minimum size to consider a file (raw / processed) to be valid
 MIN_VALID_SIZE_BYTES = 1e6
 
-# list of iso3 countries member of ENTSO-E
-ENTSO_E_ISO3_LIST = [
-    "NOR",
-    "FRA",
-    "SWE",
-    "POL",
-    "AUT",
-    "HUN",
-    "ROU",
-    "LTU",
-    "LVA",
-    "EST",
-    "DEU",
-    "BGR",
-    "GRC",
-    "ALB",
-    "HRV",
-    "CHE",
-    "LUX",
-    "BEL",
-    "NLD",
-    "PRT",
-    "ESP",
-    "IRL",
-    "ITA",
-    "DNK",
-    "GBR",
-    "ISL",
-    "SVN",
-    "FIN",
-    "SVK",
-    "CZE",
-    "CYP",
-    "BIH",
-    "MKD",
-    "SRB",
-    "MNE",
-]
+# number of rows per parquet row group, small enough for readers to skip row groups
+# using column statistics (e.g. on latitude/longitude).
+PARQUET_ROW_GROUP_SIZE = 10_000
+
+# parquet data page size (bytes)
+PARQUET_PAGE_SIZE = 1 << 20
+
+# parquet compression: zstd compresses better than snappy, at a similar decoding speed
+PARQUET_COMPRESSION = "zstd"
+PARQUET_COMPRESSION_LEVEL = 3
+
+# set of iso3 countries member of ENTSO-E
+ENTSO_E_ISO3_LIST: frozenset[str] = frozenset(
+    {
+        "NOR",
+        "FRA",
+        "SWE",
+        "POL",
+        "AUT",
+        "HUN",
+        "ROU",
+        "LTU",
+        "LVA",
+        "EST",
+        "DEU",
+        "BGR",
+        "GRC",
+        "ALB",
+        "HRV",
+        "CHE",
+        "LUX",
+        "BEL",
+        "NLD",
+        "PRT",
+        "ESP",
+        "IRL",
+        "ITA",
+        "DNK",
+        "GBR",
+        "ISL",
+        "SVN",
+        "FIN",
+        "SVK",
+        "CZE",
+        "CYP",
+        "BIH",
+        "MKD",
+        "SRB",
+        "MNE",
+    },
+)
+
+# Natural Earth resolution of the countries' boundaries ("10m", "50m" or "110m")
+WORLD_COUNTRIES_RESOLUTION = "110m"
 
 # europe bounding box (as defined by ECMWF)
 EUROPE_BOUNDING_BOX_STR = "N: 73.5 W: -27 S: 33 E: 45"
@@ -0,0 +1,17 @@
+# Analysis-ready, cloud-optimised (ARCO) ERA5 store on Google Cloud Storage
+# read more https://github.com/google-research/arco-era5
+STORE_URL = "gs://gcp-public-data-arco-era5/ar/full_37-1h-0p25deg-chunk-1.zarr-v3"
+
+# the public bucket is read anonymously
+STORAGE_OPTIONS = {"token": "anon"}
+
+# ARCO variable names (same as the CDS ones) mapped to the short names cfgrib reads from GRIB
+VARIABLE_NAMES = {
+    "2m_temperature": "t2m",
+    "total_precipitation": "tp",
+    "10m_u_component_of_wind": "u10",
+    "10m_v_component_of_wind": "v10",
+}
+
+# chunks of the local copy: a day of full (lat, lon) fields
+LOCAL_CHUNKS = {"valid_time": 24, "latitude": -1, "longitude": -1}
@@ -0,0 +1,128 @@
+import shutil
+from functools import cached_property
+from pathlib import Path
+
+import structlog
+import xarray as xr
+
+from weather_weaver.inputs.ecmwf.arco import constants
+from weather_weaver.inputs.ecmwf.cds.request import ECMWFCDSRequest
+from weather_weaver.models.fetcher import FetcherInterface
+
+logger = structlog.getLogger()
+
+
+class ECMWFARCOFetcher(FetcherInterface):
+    """Fetch ERA5 data from the ARCO zarr store, as an alternative to the CDS queue.
+
+    Only the chunks covering the requested area, variables and times are read.
+    """
+
+    def __init__(
+        self,
+        store_url: str = constants.STORE_URL,
+    ) -> None:
+        super().__init__()
+        self.store_url = store_url
+        logger.debug(
+            event="Init fetcher",
+            source="ARCO",
+            store_url=store_url,
+        )
+
+    @cached_property
+    def store(self) -> xr.Dataset:
+        """Lazily opened ARCO ERA5 store (metadata only)."""
+        return xr.open_zarr(
+            self.store_url,
+            chunks={},
+            storage_options=constants.STORAGE_OPTIONS,
+        )
+
+    def list_raw_files(self) -> None:
+        """List all raw files matching a given request.
+
+        Not supported: the ARCO store is a single zarr dataset covering all of ERA5, not a
+        collection of per-request files, requests are selected from it in `select`.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def select(store: xr.Dataset, request: ECMWFCDSRequest) -> xr.Dataset:
+        """Select the request variables, area and times from the store."""
+        ds = store[list(request.nwp_parameters)]
+
+        # select times first, so that the longitude sort below only runs on those
+        ds = ds.sel(time=slice(min(request.years), max(request.years)))
+        time = ds.indexes["time"]
+        mask = (
+            time.year.isin([int(t) for t in request.years])
+            & time.month.isin([int(t) for t in request.months])
+            & time.day.isin([int(t) for t in request.days])
+            & time.hour.isin([int(t.split(":")[0]) for t in request.times])
+        )
+        ds = ds.isel(time=mask)
+
+        # ARCO longitudes span [0, 360), request areas use [-180, 180)
+        ds = ds.assign_coords(longitude=(ds["longitude"] + 180) % 360 - 180).sortby("longitude")
+        latlon_bounds = request.area.to_latlon_dict()
+        ds = ds.sel(
+            # latitudes are descending
+            latitude=slice(latlon_bounds["max_lat"], latlon_bounds["min_lat"]),
+            longitude=slice(latlon_bounds["min_lon"], latlon_bounds["max_lon"]),
+        )
+
+        # match the layout of datasets read from CDS GRIB files
+        variable_names = {
+            name: short_name
+            for name, short_name in constants.VARIABLE_NAMES.items()
+            if name in ds.data_vars
+        }
+        return ds.rename({"time": "valid_time", **variable_names})
+
+    def download_raw_file(
+        self,
+        request: ECMWFCDSRequest,
+        raw_dir: Path,
+        update: bool = False,
+    ) -> Path:
+        """Copy the selection matching a request to a local zarr store."""
+        destination_path = raw_dir / f"{request.file_name}.zarr"
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # consolidated metadata is written last, only complete stores have it
+        if (destination_path / ".zmetadata").exists() and not update:
+            logger.debug(
+                event="Download raw files skipped.",
+                fetcher=self.__class__.__name__,
+                years=request.years,
+                product_type=request.product_type,
+                destination_path=destination_path,
+            )
+            return destination_path
+
+        try:
+            ds = self.select(self.store, request).chunk(constants.LOCAL_CHUNKS)
+            # drop the remote chunk encoding, chunks are set above
+            for var in ds.variables.values():
+                var.encoding.clear()
+            ds.to_zarr(destination_path, mode="w", consolidated=True)
+        except Exception as e:
+            logger.error(
+                event="Download raw files failed.",
+                error=e,
+                request=request,
+            )
+            # delete partial download
+            if destination_path.is_dir():
+                shutil.rmtree(destination_path)
+            return None
+
+        logger.debug(
+            event="Download raw files complete.",
+            fetcher=self.__class__.__name__,
+            years=request.years,
+            product_type=request.product_type,
+            destination_path=destination_path,
+        )
+        return destination_path
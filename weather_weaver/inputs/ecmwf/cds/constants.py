@@ -1,16 +1,26 @@
 DATASET_NAME = "reanalysis-era5-single-levels"
 
-NWP_PARAMETERS = [
+# immutable defaults, shared as-is by every request built
+NWP_PARAMETERS: tuple[str, ...] = (
     "2m_temperature",
     "total_precipitation",
     "10m_u_component_of_wind",
     "10m_v_component_of_wind",
-]
+)
 
-DEFAULT_MONTHS = [str(t) for t in range(1, 13)]
+DEFAULT_MONTHS: tuple[str, ...] = tuple(str(t) for t in range(1, 13))
 
-DEFAULT_DAYS = [str(t) for t in range(1, 32)]
+DEFAULT_DAYS: tuple[str, ...] = tuple(str(t) for t in range(1, 32))
 
-DEFAULT_TIMES = [f"{str(t).zfill(2)}:00" for t in range(24)]
+DEFAULT_TIMES: tuple[str, ...] = tuple(f"{str(t).zfill(2)}:00" for t in range(24))
 
 COORDINATE_ALLOW_LIST: list[str] = ["valid_time", "latitude", "longitude"]
+COORDINATE_ALLOW_SET: frozenset[str] = frozenset(COORDINATE_ALLOW_LIST)
+
+# dask chunks used when loading raw files: full (lat, lon) fields, step kept whole so that
+# time/step can be collapsed into valid_time without rechunking.
+LOAD_CHUNKS = {"time": "auto", "step": -1, "latitude": -1, "longitude": -1}
+
+# hashing algorithm used to derive file names from request parameters.
+# set to "sha1" to keep matching raw/processed files cached before the switch to xxh3.
+FILE_NAME_HASH_ALGORITHM = "xxh3_128"
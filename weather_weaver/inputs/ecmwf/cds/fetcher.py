@@ -1,3 +1,5 @@
+import os
+import threading
 from pathlib import Path
 
 import cdsapi
@@ -10,21 +12,66 @@ from weather_weaver.models.fetcher import FetcherInterface
 logger = structlog.getLogger()
 
 
+def _list_file_sizes(directory: Path) -> dict[str, int]:
+    """Size of the files in a directory, from a single listing."""
+    with os.scandir(directory) as entries:
+        return {entry.name: entry.stat().st_size for entry in entries if entry.is_file()}
+
+
 class ECMWFCDSFetcher(FetcherInterface):
     def __init__(
         self,
     ) -> None:
         super().__init__()
         self.client = cdsapi.Client()
+        # size of the files of each raw directory, listed once per fetcher (downloads run
+        # in concurrent threads, hence the lock)
+        self._raw_file_sizes: dict[Path, dict[str, int]] = {}
+        self._raw_file_sizes_lock = threading.Lock()
         logger.debug(
             event="Init fetcher",
             source="CDS",
         )
 
+    def __getstate__(self) -> dict:
+        """Pickle the fetcher without its lock and listings, which are local to a process."""
+        state = self.__dict__.copy()
+        del state["_raw_file_sizes"], state["_raw_file_sizes_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the fetcher with a new lock and empty listings."""
+        self.__dict__.update(state)
+        self._raw_file_sizes = {}
+        self._raw_file_sizes_lock = threading.Lock()
+
     def list_raw_files(self) -> None:
         """List all raw files matching a given request."""
         raise NotImplementedError
 
+    def _is_downloaded(self, path: Path, min_size_bytes: float) -> bool:
+        """Check a raw file was downloaded, using the directory listing to skip missing files."""
+        with self._raw_file_sizes_lock:
+            if path.parent not in self._raw_file_sizes:
+                self._raw_file_sizes[path.parent] = _list_file_sizes(path.parent)
+            listed = self._raw_file_sizes[path.parent].get(path.name, 0) > min_size_bytes
+        if not listed:
+            return False
+        # the file may have changed (or been deleted) since the listing
+        try:
+            return path.stat().st_size > min_size_bytes
+        except FileNotFoundError:
+            return False
+
+    def _set_raw_file_size(self, path: Path, size: int | None) -> None:
+        """Record the size of a raw file in the listing (None if the file is gone)."""
+        with self._raw_file_sizes_lock:
+            file_sizes = self._raw_file_sizes.setdefault(path.parent, {})
+            if size is None:
+                file_sizes.pop(path.name, None)
+            else:
+                file_sizes[path.name] = size
+
     def download_raw_file(
         self,
         request: ECMWFCDSRequest,
@@ -36,11 +83,8 @@ class ECMWFCDSFetcher(FetcherInterface):
         destination_path = raw_dir / f"{request.file_name}.grib"
         destination_path.parent.mkdir(parents=True, exist_ok=True)
 
-        if (
-            destination_path.exists()
-            and destination_path.stat().st_size > min_size_bytes
-            and not update
-        ):
+        # a single directory listing instead of stat calls for every missing file
+        if not update and self._is_downloaded(destination_path, min_size_bytes):
             logger.debug(
                 event="Download raw files skipped.",
                 fetcher=self.__class__.__name__,
@@ -69,8 +113,10 @@ class ECMWFCDSFetcher(FetcherInterface):
             # delete partial download file
             if destination_path.is_file():
                 destination_path.unlink()
+            self._set_raw_file_size(destination_path, None)
             return None
 
+        self._set_raw_file_size(destination_path, destination_path.stat().st_size)
         logger.debug(
             event="Download raw files complete.",
             fetcher=self.__class__.__name__,
@@ -1,11 +1,11 @@
 from pathlib import Path
 
 import cfgrib
-import dask.array as da
-import dask_geopandas as dask_gpd
+import dask.dataframe
 import xarray as xr
 
 from weather_weaver.inputs.ecmwf.cds import constants
+from weather_weaver.inputs.ecmwf.constants import GRIB_INDEX_PATH, HILBERT_DISTANCE_COLUMN
 from weather_weaver.inputs.ecmwf.processor import EMCWFProcessor
 from weather_weaver.models.geo import GeoFilterModel
 
@@ -14,85 +14,70 @@ class EMCWFCDSProcessor(EMCWFProcessor):
     @staticmethod
     def load(path: Path) -> list[xr.Dataset]:
         """Load raw files."""
-        return cfgrib.open_datasets(path=path)
+        if path.suffix == ".zarr":
+            # local copy from the ARCO store
+            return [xr.open_zarr(path)]
+        return cfgrib.open_datasets(
+            path=path.resolve().as_posix(),
+            backend_kwargs={"indexpath": GRIB_INDEX_PATH},
+            chunks=constants.LOAD_CHUNKS,
+        )
 
     @staticmethod
-    def pre_process(datasets: list[xr.Dataset]) -> list[xr.Dataset]:
+    def _normalize_one(ds: xr.Dataset) -> xr.Dataset:
+        """Flatten time/step into valid_time, drop unwanted coordinates and rename."""
+        if "time" in ds.dims and "step" in ds.dims:
+            # need to reshape the dimensions to drop time/step and keep valid_time only
+            # (a view for numpy arrays, a lazy blockwise reshape for dask ones as step is
+            # loaded in a single chunk): no data is copied here, so keep it in numpy/dask.
+            ds = ds.assign_coords(valid_time=ds["valid_time"].values.ravel())
+
+            # Flatten the other variables and assign them to the new valid_time coordinate
+            for var in ds.data_vars:
+                if "time" in ds[var].dims and "step" in ds[var].dims:
+                    shape = ds[var].shape
+                    new_shape = (shape[0] * shape[1], *shape[2:])
+                    new_dims = ("valid_time", *ds[var].dims[2:])
+                    ds[var] = (new_dims, ds[var].data.reshape(new_shape))
+            ds = ds.drop_vars(["time", "step"])
+        elif "valid_time" not in ds.dims:
+            ds = ds.swap_dims({"time": "valid_time"})
+
+        # Delete unwanted coordinates, then rename
+        return ds.drop_vars(
+            names=[c for c in ds.coords if c not in constants.COORDINATE_ALLOW_SET],
+            errors="ignore",
+        ).rename({"valid_time": "timestamp"})
+
+    @classmethod
+    def pre_process(cls, datasets: list[xr.Dataset]) -> list[xr.Dataset]:
         """Pre-process datasets to help with merging them."""
-        for i, ds in enumerate(datasets):
-            if "time" in ds.dims and "step" in ds.dims:
-                # need to reshape the dimensions to drop time/step and keep valid_time only
-                valid_time_1d = da.from_array(ds["valid_time"].values, chunks=(-1)).flatten()
-                ds = ds.assign_coords(valid_time=valid_time_1d)
-
-                # Flatten the other variables and assign them to the new valid_time coordinate
-                for var in ds.data_vars:
-                    if "time" in ds[var].dims and "step" in ds[var].dims:
-                        shape = ds[var].shape
-                        new_shape = (shape[0] * shape[1],) + shape[2:]
-                        reshaped_data = da.from_array(
-                            ds[var].values,
-                            chunks=shape,
-                        ).reshape(new_shape)
-                        new_dims = ("valid_time",) + ds[var].dims[2:]
-                        ds[var] = (new_dims, reshaped_data)
-                ds = ds.drop_vars(["time", "step"])
-            elif "valid_time" not in ds.dims:
-                ds = ds.swap_dims({"time": "valid_time"})
-
-            # Delete unwanted coordinates
-            ds = ds.drop_vars(
-                names=[c for c in ds.coords if c not in constants.COORDINATE_ALLOW_LIST],
-                errors="ignore",
-            )
-            # finally rename
-            ds = ds.rename({"valid_time": "timestamp"})
-            datasets[i] = ds
-
-        return datasets
+        return [cls._normalize_one(ds) for ds in datasets]
 
-    @staticmethod
+    @classmethod
     def process(
+        cls,
         dataset: xr.Dataset,
-    ) -> dask_gpd.GeoDataFrame:
-        """Convert a xarray dataset to a dask GeoDataFrame."""
-        ddf = dataset.to_dask_dataframe()
-        # assign geometry
-        ddf = dask_gpd.from_dask_dataframe(
-            ddf,
-            geometry=dask_gpd.points_from_xy(
-                ddf,
-                "longitude",
-                "latitude",
-                # crs=4326, # TODO: investigate why param is not set on ddf using points_from_xy
-            ),
+    ) -> dask.dataframe.DataFrame:
+        """Convert a xarray dataset to a dask DataFrame."""
+        # float32 is enough for the 0.25° grid and the GRIB-encoded values,
+        # and halves the bytes moved through the dataframe and parquet stages.
+        dataset = dataset.astype("float32").assign_coords(
+            latitude=dataset["latitude"].astype("float32"),
+            longitude=dataset["longitude"].astype("float32"),
         )
-        ddf.crs = 4326
-        return ddf
+        # computed once on the grid, broadcast to every row by to_dask_dataframe
+        dataset = dataset.assign_coords(
+            {HILBERT_DISTANCE_COLUMN: cls._hilbert_distance(dataset)},
+        )
+        return dataset.to_dask_dataframe()
 
-    @staticmethod
-    def post_process(ddf: dask_gpd.GeoDataFrame) -> dask_gpd.GeoDataFrame:
+    @classmethod
+    def post_process(cls, ddf: dask.dataframe.DataFrame) -> dask.dataframe.DataFrame:
         """Post process df by dropping non-required columns if they exist."""
-        columns_to_drop = ["geometry", "index_right"]
-        existing_columns_to_drop = [col for col in columns_to_drop if col in ddf.columns]
-        ddf = ddf.drop(columns=existing_columns_to_drop)
-
-        # drop null values on parameters.
-        var_parms = [
-            col
-            for col in ddf.columns
-            if col
-            not in [
-                "latitude",
-                "longitude",
-                "timestamp",
-                "country_name",
-                "country_iso3",
-            ]
-        ]
-        ddf = ddf.dropna(subset=var_parms)
-
-        # add back run-time column
+        ddf = super().post_process(ddf)
+
+        # add back run-time column (same schema as the open data outputs)
         ddf["run_time"] = ddf["timestamp"]
 
         return ddf
@@ -102,20 +87,25 @@ class EMCWFCDSProcessor(EMCWFProcessor):
         raw_path: Path,
         geo_filter: GeoFilterModel,
         interpolate: bool = False,
-    ) -> dask_gpd.GeoDataFrame:
+    ) -> dask.dataframe.DataFrame:
         """Process raw file."""
         datasets = self.load(raw_path)
         datasets = self.pre_process(datasets)
         dataset = self.merge_datasets(datasets)
+        # cheap coordinate slice before building the (much larger) dataframe
+        dataset = geo_filter.filter_dataset(dataset)
         if interpolate:
             dataset = self.interpolate(dataset)
+        # geotag the grid cells once, rather than every (timestamp, cell) row
+        dataset = geo_filter.tag_dataset(dataset)
         ddf = self.process(
             dataset=dataset,
         )
 
-        del datasets
+        # drop cells outside of the filter geometries, and null values on parameters
+        ddf = ddf.dropna(subset=[*geo_filter.tag_columns, *dataset.data_vars])
 
-        ddf = geo_filter.filter_dask(ddf)
+        del datasets
         ddf = self.post_process(ddf)
 
         return ddf
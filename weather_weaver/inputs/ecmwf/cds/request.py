@@ -1,9 +1,12 @@
 import datetime as dt
 import hashlib
 from enum import Enum
+from functools import cached_property
 from typing import Any, Generator
 
-from pydantic import field_serializer
+import orjson
+import xxhash
+from pydantic import ConfigDict, field_serializer
 
 from weather_weaver.inputs.ecmwf.cds import constants
 from weather_weaver.models.geo import BoundingBox
@@ -20,30 +23,50 @@ class DatasetName(Enum):
 
 class ECMWFCDSRequest(BaseRequest):
     dataset: DatasetName
-    years: list[str]
-    months: list[str]
-    days: list[str]
-    times: list[str]
-    nwp_parameters: list[str]
+    years: tuple[str, ...]
+    months: tuple[str, ...]
+    days: tuple[str, ...]
+    times: tuple[str, ...]
+    nwp_parameters: tuple[str, ...]
     product_type: ProductType
     area: BoundingBox
 
-    class Config:  # noqa: D106
-        arbitrary_types_allowed = True
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    @field_serializer("area")
+    @field_serializer("area", when_used="json")
     def serialize_area(self, area: BoundingBox, _info) -> str:  # noqa: ANN001
         """Custom serializer for bounding box."""
         return area.geometry.wkt
 
-    @property
+    def _params_digest(self, algorithm: str = constants.FILE_NAME_HASH_ALGORITHM) -> str:
+        """Digest of the request parameters (no cryptographic use)."""
+        match algorithm:
+            case "xxh3_128":
+                # canonical parameters encoded by orjson, skipping pydantic's serializer
+                # (the model itself stays pydantic, as the BaseRequest interface expects)
+                params = (
+                    self.dataset.value,
+                    self.years,
+                    self.months,
+                    self.days,
+                    self.times,
+                    self.nwp_parameters,
+                    self.product_type.value,
+                    self.area.geometry.wkt,
+                )
+                return xxhash.xxh3_128_hexdigest(orjson.dumps(params))
+            case "sha1":
+                # legacy file names were hashed from the pydantic json dump
+                params_json = self.model_dump_json()
+                return hashlib.sha1(params_json.encode("utf-8")).hexdigest()  # noqa: S324
+            case _:
+                raise NotImplementedError(f"{algorithm=} not implemented yet!")
+
+    @cached_property
     def file_name(self) -> str:
         """File name based on request parameters."""
-        params_json = self.model_dump_json()
         years = "-".join(self.years)
-        return (
-            f"{self.dataset.value}/{years}-{hashlib.sha1(params_json.encode("utf-8")).hexdigest()}"  # noqa: S324
-        )
+        return f"{self.dataset.value}/{years}-{self._params_digest()}"
 
     def to_cds_request(self) -> dict[str, Any]:
         """Create request compatible with CDS client."""
@@ -84,10 +107,11 @@ class ECMWFCDSRequestBuilder(BaseRequestBuilder):
         Download default variables as defined in constants.NWP_PARAMETERS.
         covering all months and days and times in the year.
         """
+        # all inputs are already typed constants, skip validation
         return [
-            ECMWFCDSRequest(
+            ECMWFCDSRequest.model_construct(
                 dataset=DatasetName.ERA5_SINGLE_LEVELS,
-                years=[str(run_date.year)],
+                years=(str(run_date.year),),
                 months=constants.DEFAULT_MONTHS,
                 days=constants.DEFAULT_DAYS,
                 times=constants.DEFAULT_TIMES,
@@ -25,8 +25,20 @@ RAW_DIR.mkdir(exist_ok=True)
 PROCESSED_DIR = ECMWF_DIR / "processed"
 PROCESSED_DIR.mkdir(exist_ok=True)
 
+# cfgrib index files are written next to raw files, and re-used when the same file is re-opened
+# (cfgrib ignores indexes older than their GRIB file)
+GRIB_INDEX_PATH = "{path}.{short_hash}.idx"
+
+# dask chunks used when loading raw files: one chunk per GRIB message (a (lat, lon) field),
+# so that arrays are dask-backed from the start and never need rechunking.
+LOAD_CHUNKS = {"step": 1, "latitude": -1, "longitude": -1}
+
 # list of coordinates to keep from raw datasets
 COORDINATE_ALLOW_LIST: list[str] = ["time", "step", "latitude", "longitude"]
+COORDINATE_ALLOW_SET: frozenset[str] = frozenset(COORDINATE_ALLOW_LIST)
 
 # The target resolution when resampling datasets.
 TARGET_RESOLUTION = 0.2
+
+# temporary column used to order output rows along a hilbert curve
+HILBERT_DISTANCE_COLUMN = "hilbert_distance"
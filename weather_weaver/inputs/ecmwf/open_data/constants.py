@@ -3,12 +3,34 @@ DATA_SOURCE = "azure"
 
 # list of parameters to download limited by what is available in the open-data catalogue
 # read more about request parameters https://github.com/ecmwf/ecmwf-opendata?tab=readme-ov-file#parameters-and-levels
-NWP_PARAMETERS = [
+NWP_PARAMETERS: tuple[str, ...] = (
     "2t",
     "tp",
     "10u",
     "10v",
-]
+)
 
 # limit to 90 hourly steps by default
-FORECAST_STEPS = [3 * i for i in range(31)]
+FORECAST_STEPS: tuple[int, ...] = tuple(3 * i for i in range(31))
+
+# max number of (per step) files of a single request downloaded concurrently
+MAX_CONCURRENT_DOWNLOADS = 8
+
+# size of the chunks streamed to disk when downloading (in bytes)
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# timeout of download requests (in seconds)
+DOWNLOAD_TIMEOUT = 60
+
+# max number of connections kept alive by the fetcher http session
+# (concurrent downloads of all requests fetched at once)
+HTTP_POOL_MAXSIZE = 32
+
+# attempts made to download a byte range, interrupted transfers resume where they stopped
+DOWNLOAD_ATTEMPTS = 3
+
+# base of the exponential wait between download attempts (in seconds)
+DOWNLOAD_BACKOFF_SECONDS = 0.5
+
+# max number of listings (one per run and request parameters) cached by the fetcher
+URLS_CACHE_MAXSIZE = 128
@@ -1,7 +1,17 @@
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import BinaryIO
 
+import requests
 import structlog
 from ecmwf.opendata import Client as ECMWFClient
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from weather_weaver.constants import MIN_VALID_SIZE_BYTES
 from weather_weaver.inputs.ecmwf.open_data import constants
@@ -10,6 +20,36 @@ from weather_weaver.models.fetcher import FetcherInterface
 
 logger = structlog.getLogger()
 
+# every GRIB message ends with this section, so does a complete GRIB file
+GRIB_END_SECTION = b"7777"
+
+
+def _is_complete_grib(path: Path, min_size_bytes: float) -> bool:
+    """Check a GRIB file is large enough and ends with the "7777" end section.
+
+    Catches truncated downloads, reading only the last 4 bytes of the file.
+    """
+    try:
+        with path.open("rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size <= min_size_bytes:
+                return False
+            f.seek(-len(GRIB_END_SECTION), os.SEEK_END)
+            return f.read() == GRIB_END_SECTION
+    except FileNotFoundError:
+        return False
+
+
+def _merge_parts(parts: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Merge contiguous (offset, length) byte ranges, to limit the number of range requests."""
+    merged = []
+    for offset, length in sorted(parts):
+        if merged and merged[-1][0] + merged[-1][1] == offset:
+            merged[-1] = (merged[-1][0], merged[-1][1] + length)
+        else:
+            merged.append((offset, length))
+    return merged
+
 
 class ECMWFOpenDataFetcher(FetcherInterface):
     def __init__(
@@ -19,14 +59,53 @@ class ECMWFOpenDataFetcher(FetcherInterface):
         super().__init__()
         self.data_source = data_source
         self.client = ECMWFClient(source=self.data_source)
+        # keep-alive connections re-used across all downloads of the fetcher
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_maxsize=constants.HTTP_POOL_MAXSIZE,
+                max_retries=Retry(total=3, backoff_factor=0.3),
+            ),
+        )
+        # index listings by request parameters, as fetching (and json parsing) them inside the
+        # ECMWF client is a round trip per step. least recently used listings are evicted, and
+        # downloads run in concurrent threads, hence the lock.
+        self._urls_cache: OrderedDict[tuple, list[tuple[str, tuple[int]]]] = OrderedDict()
+        self._urls_cache_lock = threading.Lock()
         logger.debug(
             event="Init fetcher",
             source="ECMWF",
             data_source=data_source,
         )
 
+    def __getstate__(self) -> dict:
+        """Pickle the fetcher without its lock and cached listings, which are local to a process."""
+        state = self.__dict__.copy()
+        del state["_urls_cache"], state["_urls_cache_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the fetcher with a new lock and no cached listings."""
+        self.__dict__.update(state)
+        self._urls_cache = OrderedDict()
+        self._urls_cache_lock = threading.Lock()
+
     def list_raw_files(self, request: ECMWFOpenDataRequest) -> list[tuple[str, tuple[int]]] | None:
         """List all raw files matching a given request."""
+        cache_key = (
+            request.run_date,
+            request.run_time,
+            request.stream,
+            request.request_type,
+            request.nwp_parameters,
+            request.forecast_steps,
+        )
+        with self._urls_cache_lock:
+            if cache_key in self._urls_cache:
+                self._urls_cache.move_to_end(cache_key)
+                return self._urls_cache[cache_key]
+
         try:
             results = self.client._get_urls(
                 request=request.to_ecmwf_request(),
@@ -40,8 +119,79 @@ class ECMWFOpenDataFetcher(FetcherInterface):
                 request=request,
             )
             return None
+        with self._urls_cache_lock:
+            self._urls_cache[cache_key] = results.urls
+            if len(self._urls_cache) > constants.URLS_CACHE_MAXSIZE:
+                self._urls_cache.popitem(last=False)
         return results.urls
 
+    def _download_range(
+        self,
+        url: str,
+        byte_range: tuple[int, int] | None,
+        f: BinaryIO,
+    ) -> None:
+        """Stream a byte range (the whole file if None) of url to f.
+
+        Interrupted transfers are resumed from the last byte written, instead of from the
+        start of the range.
+        """
+        start_position = f.tell()
+        offset, length = byte_range if byte_range is not None else (0, None)
+        written = 0
+        for attempt in range(constants.DOWNLOAD_ATTEMPTS):
+            headers = {}
+            if length is not None:
+                headers["Range"] = f"bytes={offset + written}-{offset + length - 1}"
+            elif written > 0:
+                headers["Range"] = f"bytes={written}-"
+            try:
+                with self.session.get(
+                    url=url,
+                    headers=headers,
+                    stream=True,
+                    timeout=constants.DOWNLOAD_TIMEOUT,
+                ) as response:
+                    response.raise_for_status()
+                    if (
+                        "Range" in headers
+                        and response.status_code != requests.codes.partial_content
+                    ):
+                        if length is not None:
+                            # the body is the whole object, not the requested range
+                            raise ValueError(f"Range request ignored by the server for {url=}")
+                        # resuming a whole file, but range ignored: restart from scratch
+                        f.seek(start_position)
+                        f.truncate()
+                        written = 0
+                    for chunk in response.iter_content(chunk_size=constants.DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        written += len(chunk)
+                return
+            except requests.RequestException as e:
+                if attempt == constants.DOWNLOAD_ATTEMPTS - 1:
+                    raise
+                logger.debug(
+                    event="Download interrupted, resuming.",
+                    error=e,
+                    url=url,
+                    written=written,
+                )
+                time.sleep(constants.DOWNLOAD_BACKOFF_SECONDS * 2**attempt)
+
+    def _download_url(
+        self,
+        url: tuple[str, list[tuple[int, int]] | None],
+        destination_path: Path,
+    ) -> Path:
+        """Stream the byte ranges of a single file to a local path."""
+        url, parts = url
+        byte_ranges = [None] if parts is None else _merge_parts(parts)
+        with destination_path.open("wb") as f:
+            for byte_range in byte_ranges:
+                self._download_range(url, byte_range, f)
+        return destination_path
+
     def download_raw_file(
         self,
         request: ECMWFOpenDataRequest,
@@ -50,50 +200,53 @@ class ECMWFOpenDataFetcher(FetcherInterface):
         min_size_bytes: float = MIN_VALID_SIZE_BYTES,
     ) -> Path:
         """Wrapper around ECMWF open data client."""
-        destination_path = raw_dir / f"{request.file_name}.grib2"
-        destination_path.parent.mkdir(parents=True, exist_ok=True)
-
-        if (
-            destination_path.exists()
-            and destination_path.stat().st_size > min_size_bytes
-            and not update
-        ):
-            logger.debug(
-                event="Download raw files skipped.",
-                fetcher=self.__class__.__name__,
-                data_source=self.data_source,
-                run_date=request.run_date,
-                run_time=request.run_time,
-                stream=request.stream,
-                type=request.request_type,
-                destination_path=destination_path,
-            )
-            return destination_path
-
-        try:
-            self.client.retrieve(
-                request=request.to_ecmwf_request(),
-                target=destination_path,
-            )
-        except Exception as e:
-            logger.error(
-                event="Download raw files failed.",
-                error=e,
-                request=request,
-            )
-            # delete partial download file
-            if destination_path.is_file():
-                destination_path.unlink()
-            return None
-
-        logger.debug(
-            event="Download raw files complete.",
+        # bind the request context once, for all the events logged while downloading it
+        with structlog.contextvars.bound_contextvars(
             fetcher=self.__class__.__name__,
             data_source=self.data_source,
             run_date=request.run_date,
             run_time=request.run_time,
             stream=request.stream,
             type=request.request_type,
-            destination_path=destination_path,
-        )
-        return destination_path
+        ):
+            destination_path = raw_dir / f"{request.file_name}.grib2"
+            destination_path.parent.mkdir(parents=True, exist_ok=True)
+
+            if not update and _is_complete_grib(destination_path, min_size_bytes):
+                logger.debug(
+                    event="Download raw files skipped.",
+                    destination_path=destination_path,
+                )
+                return destination_path
+
+            urls = self.list_raw_files(request)
+            if urls is None:
+                return None
+
+            part_paths = [destination_path.with_suffix(f".part{i}") for i in range(len(urls))]
+            try:
+                # fetch the files of each step concurrently, then concatenate them in order
+                with ThreadPoolExecutor(max_workers=constants.MAX_CONCURRENT_DOWNLOADS) as executor:
+                    list(executor.map(self._download_url, urls, part_paths))
+                with destination_path.open("wb") as f:
+                    for part_path in part_paths:
+                        with part_path.open("rb") as part:
+                            shutil.copyfileobj(part, f)
+            except Exception as e:
+                logger.error(
+                    event="Download raw files failed.",
+                    error=e,
+                )
+                # delete partial download file
+                if destination_path.is_file():
+                    destination_path.unlink()
+                return None
+            finally:
+                for part_path in part_paths:
+                    part_path.unlink(missing_ok=True)
+
+            logger.debug(
+                event="Download raw files complete.",
+                destination_path=destination_path,
+            )
+            return destination_path
@@ -1,5 +1,6 @@
 import datetime as dt
 from enum import Enum
+from functools import cached_property
 from typing import Any, Generator
 
 from weather_weaver.inputs.ecmwf.open_data import constants
@@ -28,12 +29,12 @@ class ECMWFOpenDataRequest(BaseRequest):
     run_time: RunTime
     stream: StreamType
     request_type: RequestType
-    nwp_parameters: list[str]
-    forecast_steps: list[int]
+    nwp_parameters: tuple[str, ...]
+    forecast_steps: tuple[int, ...]
     update_raw: bool = False
     normalise_data: bool = False
 
-    @property
+    @cached_property
     def file_name(self) -> str:
         """File name based on request parameters."""
         _name = "_".join(
@@ -52,10 +53,10 @@ class ECMWFOpenDataRequest(BaseRequest):
         return {
             "stream": self.stream.value,
             "type": self.request_type.value,
-            "param": self.nwp_parameters,
+            "param": list(self.nwp_parameters),
             "date": self.run_date,
             "time": self.run_time.value,
-            "step": self.forecast_steps,
+            "step": list(self.forecast_steps),
         }
 
     @property
@@ -72,6 +73,21 @@ class ECMWFOpenDataRequestBuilder(BaseRequestBuilder):
         super().__init__(*args, **kwargs)
         self.default_nwp_parameters = constants.NWP_PARAMETERS
         self.default_forecast_steps = constants.FORECAST_STEPS
+        # stream / request types / run_times combinations, the same for every run_date
+        self._run_specs = tuple(
+            (stream, request_type, run_time)
+            for stream, request_type in zip(
+                [
+                    StreamType.OPER,
+                    # StreamType.ENFO,
+                ],
+                [
+                    RequestType.FORECAST,
+                    # RequestType.PERTUBED_FORECAST,
+                ],
+            )
+            for run_time in RunTime
+        )
 
     def build_default_requests(
         self,
@@ -85,29 +101,18 @@ class ECMWFOpenDataRequestBuilder(BaseRequestBuilder):
         - oper + fc @ all run times
         # - ens + pfc @ all run times
         """
-        all_requests = []
-        for stream, request_type in zip(
-            [
-                StreamType.OPER,
-                # StreamType.ENFO,
-            ],
-            [
-                RequestType.FORECAST,
-                # RequestType.PERTUBED_FORECAST,
-            ],
-        ):
-            for run_time in list(RunTime):
-                all_requests.append(
-                    ECMWFOpenDataRequest(
-                        run_date=run_date,
-                        run_time=run_time,
-                        stream=stream,
-                        request_type=request_type,
-                        nwp_parameters=self.default_nwp_parameters,
-                        forecast_steps=self.default_forecast_steps,
-                    ),
-                )
-        return all_requests
+        # all inputs are already typed constants, skip validation
+        return [
+            ECMWFOpenDataRequest.model_construct(
+                run_date=run_date,
+                run_time=run_time,
+                stream=stream,
+                request_type=request_type,
+                nwp_parameters=self.default_nwp_parameters,
+                forecast_steps=self.default_forecast_steps,
+            )
+            for stream, request_type, run_time in self._run_specs
+        ]
 
     def build_closest_requests(
         self,
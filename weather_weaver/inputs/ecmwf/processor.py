@@ -1,8 +1,10 @@
 from pathlib import Path
 
 import cfgrib
-import dask_geopandas as dask_gpd
+import dask.dataframe
+import geopandas as gpd
 import numpy as np
+import pandas as pd
 import xarray as xr
 
 from weather_weaver.inputs.ecmwf import constants
@@ -11,30 +13,33 @@ from weather_weaver.models.processor import BaseProcessor
 
 
 class EMCWFProcessor(BaseProcessor):
+    # data variables kept in the outputs (all of them if None)
+    keep_vars: tuple[str, ...] | None = None
+
     @staticmethod
     def load(path: Path) -> list[xr.Dataset]:
         """Load raw files."""
-        return cfgrib.open_datasets(
+        datasets = cfgrib.open_datasets(
             path=path.resolve().as_posix(),
-            backend_kwargs={"indexpath": ""},
+            backend_kwargs={"indexpath": constants.GRIB_INDEX_PATH},
+            chunks=constants.LOAD_CHUNKS,
         )
+        # GRIB values are packed on 16-24 bits, float32 keeps all of their precision
+        # and halves the memory moved through the rest of the pipeline.
+        return [ds.astype("float32", copy=False) for ds in datasets]
 
     @staticmethod
     def pre_process(datasets: list[xr.Dataset]) -> list[xr.Dataset]:
         """Pre-process dastsets."""
-        # each dataset is specific to a single param
-        for i, ds in enumerate(datasets):
-            # Delete unwanted coordinates
-            ds = ds.drop_vars(
-                names=[c for c in ds.coords if c not in constants.COORDINATE_ALLOW_LIST],
+        # each dataset is specific to a single param: delete unwanted coordinates,
+        # and rename time field to make explicit this is the init time
+        return [
+            ds.drop_vars(
+                names=[c for c in ds.coords if c not in constants.COORDINATE_ALLOW_SET],
                 errors="ignore",
-            )
-            # rename time field to make explicit this is the init time
-            ds = ds.rename({"time": "run_time"})
-            # Put the modified dataset back in the list
-            datasets[i] = ds
-
-        return datasets
+            ).rename({"time": "run_time"})
+            for ds in datasets
+        ]
 
     @staticmethod
     def merge_datasets(datasets: list[xr.Dataset]) -> xr.Dataset:
@@ -45,8 +50,8 @@ class EMCWFProcessor(BaseProcessor):
             compat="override",
             combine_attrs="drop_conflicts",
         )
-        # unify chunks and return
-        return merged_dataset.chunk("auto").unify_chunks()
+        # datasets are chunked at load, only make sure chunks are aligned
+        return merged_dataset.unify_chunks()
 
     @staticmethod
     def interpolate(
@@ -54,67 +59,80 @@ class EMCWFProcessor(BaseProcessor):
         target_resolution: float = constants.TARGET_RESOLUTION,
     ) -> xr.Dataset:
         """Resample datasets to increate spatial resolution and interpolate."""
-        # Calculate spatial resolution
-        lat_resolution = abs(dataset["latitude"].diff(dim="latitude").mean().values)
-        lon_resolution = abs(dataset["longitude"].diff(dim="longitude").mean().values)
+        # Calculate spatial resolution (on the numpy coordinate values)
+        lat_resolution = abs(np.diff(dataset["latitude"].values).mean())
+        lon_resolution = abs(np.diff(dataset["longitude"].values).mean())
 
         if lat_resolution <= target_resolution and lon_resolution <= target_resolution:
             # No need to resample here, dataset is more granular than the target
             return dataset
 
-        scale_lat = int(lat_resolution / target_resolution)
-        scale_lon = int(lon_resolution / target_resolution)
+        scale_lat = round(lat_resolution / target_resolution)
+        scale_lon = round(lon_resolution / target_resolution)
 
-        new_lon = np.linspace(
-            dataset.longitude[0],
-            dataset.longitude[-1],
-            dataset.sizes["longitude"] * scale_lon,
-        )
+        lon = dataset["longitude"].values
+        new_lon = np.linspace(lon[0], lon[-1], lon.size * scale_lon)
 
-        new_lat = np.linspace(
-            dataset.latitude[0],
-            dataset.latitude[-1],
-            dataset.sizes["latitude"] * scale_lat,
-        )
+        lat = dataset["latitude"].values
+        new_lat = np.linspace(lat[0], lat[-1], lat.size * scale_lat)
 
-        return dataset.interp(latitude=new_lat, longitude=new_lon)
+        # keep whole (lat, lon) fields in each chunk, so that the bilinear interpolation
+        # runs independently (in parallel) on every chunk of the other dimensions.
+        dataset = dataset.chunk({"latitude": -1, "longitude": -1})
+        return dataset.interp(latitude=new_lat, longitude=new_lon, method="linear")
+
+    @staticmethod
+    def _hilbert_distance(dataset: xr.Dataset) -> xr.DataArray:
+        """Hilbert distance of each (latitude, longitude) cell of the dataset grid."""
+        lon_grid, lat_grid = np.meshgrid(dataset["longitude"].values, dataset["latitude"].values)
+        points = gpd.GeoSeries.from_xy(lon_grid.ravel(), lat_grid.ravel())
+        return xr.DataArray(
+            points.hilbert_distance().to_numpy().reshape(lon_grid.shape),
+            dims=("latitude", "longitude"),
+        )
 
     @staticmethod
+    def _hilbert_sort(df: pd.DataFrame) -> pd.DataFrame:
+        """Order the rows of a partition along a hilbert curve."""
+        return df.sort_values(constants.HILBERT_DISTANCE_COLUMN, kind="stable")
+
+    @classmethod
     def process(
+        cls,
         dataset: xr.Dataset,
-    ) -> dask_gpd.GeoDataFrame:
-        """Convert a xarray dataset to a dask GeoDataFrame."""
-        ddf = dataset.to_dask_dataframe()
-        # compute actual value_datetime
-        ddf["timestamp"] = ddf["run_time"] + ddf["step"]
-
-        # assign geometry
-        ddf = dask_gpd.from_dask_dataframe(
-            ddf,
-            geometry=dask_gpd.points_from_xy(
-                ddf,
-                "longitude",
-                "latitude",
-                # crs=4326, # TODO: investigate why param is not set on ddf using points_from_xy
-            ),
+    ) -> dask.dataframe.DataFrame:
+        """Convert a xarray dataset to a dask DataFrame."""
+        if cls.keep_vars is not None:
+            dataset = dataset[[v for v in cls.keep_vars if v in dataset.data_vars]]
+        # compute actual value_datetime, once per step (broadcast to rows by to_dask_dataframe)
+        dataset = dataset.assign_coords(timestamp=dataset["run_time"] + dataset["step"])
+        # computed once on the grid, broadcast to every row by to_dask_dataframe
+        dataset = dataset.assign_coords(
+            {constants.HILBERT_DISTANCE_COLUMN: cls._hilbert_distance(dataset)},
         )
-        ddf.crs = 4326
-        return ddf
+        # unpivots the grid dimensions blockwise (one row per cell, one column per variable)
+        ddf = dataset.to_dask_dataframe()
+        # cells without any value are not worth keeping
+        return ddf.dropna(subset=list(dataset.data_vars), how="all")
 
-    @staticmethod
-    def post_process(ddf: dask_gpd.GeoDataFrame) -> dask_gpd.GeoDataFrame:
+    @classmethod
+    def post_process(cls, ddf: dask.dataframe.DataFrame) -> dask.dataframe.DataFrame:
         """Post process df by dropping non-required columns if they exist."""
-        columns_to_drop = ["geometry", "index_right", "step"]
-        existing_columns_to_drop = [col for col in columns_to_drop if col in ddf.columns]
-        ddf = ddf.drop(columns=existing_columns_to_drop)
-        return ddf
+        # project the kept columns first (a plain getitem dask can push upstream), so that
+        # unused columns are neither sorted nor materialized.
+        columns_to_drop = {"geometry", "index_right", "step"}
+        ddf = ddf[[col for col in ddf.columns if col not in columns_to_drop]]
+        # sort points within each partition (no shuffle) so that parquet row groups cover
+        # compact areas, and readers can skip them using the lat/lon column statistics.
+        ddf = ddf.map_partitions(cls._hilbert_sort, meta=ddf._meta)
+        return ddf.drop(columns=[constants.HILBERT_DISTANCE_COLUMN])
 
     def transform(
         self,
         raw_path: Path,
         geo_filter: GeoFilterModel | None = None,
         interpolate: bool = False,
-    ) -> dask_gpd.GeoDataFrame:
+    ) -> dask.dataframe.DataFrame:
         """Process raw file."""
         datasets = self.load(raw_path)
         datasets = self.pre_process(datasets)
@@ -123,11 +141,14 @@ class EMCWFProcessor(BaseProcessor):
             dataset = self.interpolate(dataset)
         if geo_filter is not None:
             dataset = geo_filter.filter_dataset(dataset)
+            # geotag the grid cells once, rather than every (step, cell) row
+            dataset = geo_filter.tag_dataset(dataset)
         ddf = self.process(
             dataset=dataset,
         )
         if geo_filter is not None:
-            ddf = geo_filter.filter_dask(ddf)
+            # drop cells outside of the filter geometries
+            ddf = ddf.dropna(subset=geo_filter.tag_columns)
         ddf = self.post_process(ddf)
 
         del dataset
@@ -1,13 +1,18 @@
 import datetime as dt
 from enum import Enum
 
+import dask
+import geopandas as gpd
+import orjson
 import structlog
 import typer
+import xxhash
 from dask.distributed import Client
 from distributed import SpecCluster
 from typing_extensions import Annotated
 
 from weather_weaver import constants
+from weather_weaver.config import DATA_DIR
 from weather_weaver.inputs.ecmwf import constants as ecmwf_constants
 from weather_weaver.models.fetcher import FetcherInterface
 from weather_weaver.models.geo import GeoFilterModel
@@ -15,7 +20,7 @@ from weather_weaver.models.processor import BaseProcessor
 from weather_weaver.models.request import BaseRequestBuilder
 from weather_weaver.models.storage import StorageInterface
 from weather_weaver.outputs.localfs.client import LocalClient
-from weather_weaver.services.service import WeatherConsumerService
+from weather_weaver.services.service import PROCESSING_RESOURCE, WeatherConsumerService
 from weather_weaver.utils import OffsetFrequency
 
 logger = structlog.getLogger()
@@ -30,6 +35,7 @@ DEFAULT_THREADS_BY_WORKER = 5
 class DataSource(str, Enum):
     ECMWF_OPEN_DATA = "ECMWF [Open data]"
     ECMWF_CDS_ERA5 = "ECMWF ERA5"
+    ECMWF_ARCO_ERA5 = "ECMWF ERA5 [ARCO]"
 
 
 class StorageLocation(str, Enum):
@@ -49,12 +55,26 @@ def load_area(area: Area) -> GeoFilterModel:
     """Load geofilter matching the specified area."""
     match area:
         case Area.ENTSOE:
-            geo_filter = GeoFilterModel.from_bounding_box(
-                constants.EUROPE_BOUNDING_BOX_STR,
-            ).filter_iso3s(constants.ENTSO_E_ISO3_LIST)
+            bounding_box = constants.EUROPE_BOUNDING_BOX_STR
+            list_iso3s = constants.ENTSO_E_ISO3_LIST
 
         case _:
             raise NotImplementedError(f"{area=} not implemented yet!")
+
+    # clipping the countries to the area is slow, cache the resulting geometries
+    resolution = constants.WORLD_COUNTRIES_RESOLUTION
+    digest = xxhash.xxh3_64_hexdigest(
+        orjson.dumps([bounding_box, sorted(list_iso3s), resolution]),
+    )
+    cache_path = DATA_DIR / f"geofilter_{area.value}_{digest}.parquet"
+    if cache_path.exists():
+        return GeoFilterModel(filter_df=gpd.read_parquet(cache_path), method="within")
+
+    geo_filter = GeoFilterModel.from_bounding_box(
+        bounding_box,
+        resolution=resolution,
+    ).filter_iso3s(list_iso3s)
+    geo_filter.filter_df.to_parquet(cache_path)
     return geo_filter
 
 
@@ -80,6 +100,14 @@ def load_source(
             fetcher = ECMWFCDSFetcher()
             request_builder = ECMWFCDSRequestBuilder(geo_filter=geo_filter)
             processor = EMCWFProcessor()
+        case DataSource.ECMWF_ARCO_ERA5:
+            from weather_weaver.inputs.ecmwf.arco.fetcher import ECMWFARCOFetcher
+            from weather_weaver.inputs.ecmwf.cds.processor import EMCWFCDSProcessor
+            from weather_weaver.inputs.ecmwf.cds.request import ECMWFCDSRequestBuilder
+
+            fetcher = ECMWFARCOFetcher()
+            request_builder = ECMWFCDSRequestBuilder(geo_filter=geo_filter)
+            processor = EMCWFCDSProcessor()
         case _:
             raise NotImplementedError(f"{source=} not implemented yet!")
 
@@ -102,9 +130,13 @@ def load_cluster(
     n_workers: int,
     threads_per_worker: int,
     name: str = "Weather Weaver data download cluster.",
-) -> SpecCluster:
-    """Load cluster."""
+) -> SpecCluster | None:
+    """Load cluster (None if the local threaded scheduler is enough)."""
     match cluster_type:
+        case ClusterType.LOCAL if n_workers == 1:
+            # decoding GRIB files runs in C code releasing the GIL, so a single worker is
+            # better served by the threaded scheduler, without any distributed overhead.
+            cluster = None
         case ClusterType.LOCAL:
             from distributed import LocalCluster
 
@@ -112,6 +144,9 @@ def load_cluster(
                 name=name,
                 n_workers=n_workers,
                 threads_per_worker=threads_per_worker,
+                # at most half of the threads of a worker run batches (each holding its
+                # processed frames), the others run the tasks computing their outputs.
+                resources={PROCESSING_RESOURCE: max(1, threads_per_worker // 2)},
             )
         case _:
             raise NotImplementedError(f"{cluster_type=} not implemented yet!")
@@ -183,32 +218,41 @@ def download_datasets(
 
     storer = load_storage(storage=storage)
 
-    service = WeatherConsumerService(
-        request_builder=request_builder,
-        raw_dir=ecmwf_constants.RAW_DIR,
-        processed_dir=ecmwf_constants.PROCESSED_DIR,
-        fetcher=fetcher,
-        processor=processor,
-        storer=storer,
-    )
-
     cluster = load_cluster(
         cluster_type=cluster_type,
         n_workers=n_workers,
         threads_per_worker=threads_per_worker,
     )
 
-    # start a local dask cluster
-    dask_client = Client(cluster)
+    if cluster is None:
+        dask_client = None
+        dask_context = dask.config.set(scheduler="threads", num_workers=threads_per_worker)
+        logger.info(
+            event="Dask threaded scheduler used.",
+            threads=threads_per_worker,
+        )
+    else:
+        # start a local dask cluster
+        dask_client = dask_context = Client(cluster)
+        logger.info(
+            event="Dask cluster started.",
+            url=dask_client.dashboard_link,
+            n_workers=n_workers,
+            threads_per_worker=threads_per_worker,
+        )
 
-    logger.info(
-        event="Dask cluster started.",
-        url=dask_client.dashboard_link,
-        n_workers=n_workers,
-        threads_per_worker=threads_per_worker,
+    service = WeatherConsumerService(
+        request_builder=request_builder,
+        raw_dir=ecmwf_constants.RAW_DIR,
+        processed_dir=ecmwf_constants.PROCESSED_DIR,
+        fetcher=fetcher,
+        processor=processor,
+        storer=storer,
+        client=dask_client,
     )
 
-    try:
+    # the dask client (if any) is closed when leaving the context
+    with dask_context:
         _ = service.download_datasets(
             start=_start,
             date_offset=date_offset,
@@ -218,14 +262,9 @@ def download_datasets(
             # more info: https://docs.dask.org/en/stable/scheduling.html
             scheduler=None,
         )
-    except Exception as e:
-        raise e
-    finally:
-        # close the dask client
-        dask_client.close()
-        logger.debug(
-            event="Dask cluster closed.",
-        )
+    logger.debug(
+        event="Dask cluster closed.",
+    )
 
 
 if __name__ == "__main__":
@@ -1,15 +1,28 @@
+import importlib.util
 import re
 import shutil
-from functools import lru_cache
+from collections.abc import Collection
+from functools import cached_property, lru_cache
 from pathlib import Path
 
 import dask_geopandas as dask_gpd
 import geopandas as gpd
+import numpy as np
 import requests
 import shapely
+import urllib3
 import xarray as xr
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from weather_weaver.config import DATA_DIR
+from weather_weaver.constants import WORLD_COUNTRIES_RESOLUTION
+
+# e.g. "N: 73.5 W: -27 S: 33 E: 45"
+_BOUNDING_BOX_PATTERN = re.compile(
+    r"N:\s*(?P<north>[-\d.]+)\s+W:\s*(?P<west>[-\d.]+)\s+"
+    r"S:\s*(?P<south>[-\d.]+)\s+E:\s*(?P<east>[-\d.]+)",
+)
 
 
 class BoundingBox:
@@ -30,9 +43,10 @@ class BoundingBox:
 
         Example of expected format: "N: 73.5 W: -27 S: 33 E: 45"
         """
-        coords = map(float, re.findall(r"[NSWE]: ([-\d.]+)", value))
-        north, west, south, east = coords
-        return cls(north, west, south, east)
+        match = _BOUNDING_BOX_PATTERN.fullmatch(value.strip())
+        if match is None:
+            raise ValueError(f"Invalid bounding box {value=}")
+        return cls(**{key: float(coord) for key, coord in match.groupdict().items()})
 
     def to_latlon_dict(self) -> dict[str, float]:
         """Explicitly convert bounds to lat/lon dictionary."""
@@ -44,25 +58,55 @@ class BoundingBox:
         }
 
 
-def download_world_countries(output_path: Path, resolution: str = "110m") -> None:
+def download_world_countries(
+    output_path: Path,
+    resolution: str = WORLD_COUNTRIES_RESOLUTION,
+) -> None:
     """Download file with countries' boundaries from NaturalEarth data."""
     url = f"https://www.naturalearthdata.com/http//www.naturalearthdata.com/download/{resolution}/cultural/ne_{resolution}_admin_0_countries.zip"
-    # download the file from this url to a tmp location @ tmp_path
-    response = requests.get(url=url, stream=True, timeout=20)
-    if response.status_code == 200:
-        shutil.copyfileobj(response.raw, output_path)
-    else:
-        raise ValueError(f"Failed downloading countries boundaries to {output_path}")
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.5)))
+    # stream the file to a tmp location next to output_path, then move it in place,
+    # so that an interrupted download never leaves a truncated zip behind
+    tmp_path = output_path.with_suffix(".part")
+    try:
+        with session.get(url=url, stream=True, timeout=20) as response:
+            response.raise_for_status()
+            # let urllib3 decode any content encoding, then copy with 1 MiB reads/writes
+            response.raw.decode_content = True
+            with tmp_path.open("wb") as f:
+                shutil.copyfileobj(response.raw, f, length=1 << 20)
+        tmp_path.replace(output_path)
+    # reading response.raw directly, mid-stream errors are raised by urllib3 (not wrapped
+    # into requests exceptions)
+    except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+        raise ValueError(f"Failed downloading countries boundaries to {output_path}") from e
+    finally:
+        # left behind by any failure (no-op once moved in place)
+        tmp_path.unlink(missing_ok=True)
+
 
+# one entry per Natural Earth resolution (10m, 50m, 110m)
+@lru_cache(maxsize=4)
+def load_world_countries(resolution: str = WORLD_COUNTRIES_RESOLUTION) -> gpd.GeoDataFrame:
+    """Loads a geodataframe with all country names and geometrie.
+
+    The geodataframe is cached and shared by all callers: it must not be mutated.
+    """
+    # columns of interest are cached as (geo)parquet, much faster to read than the shapefile
+    cache_path = DATA_DIR / f"ne_{resolution}_admin_0_countries.parquet"
+    if cache_path.exists():
+        return gpd.read_parquet(cache_path)
 
-@lru_cache(maxsize=128)
-def load_world_countries(resolution: str = "110m") -> gpd.GeoDataFrame:
-    """Loads a geodataframe with all country names and geometrie."""
     path = DATA_DIR / f"ne_{resolution}_admin_0_countries.zip"
     if not path.exists():
         # download file
         download_world_countries(output_path=path, resolution=resolution)
-    world = gpd.read_file(path)
+    if importlib.util.find_spec("pyogrio") is not None:
+        # reads the shapefile through GDAL's vector API (and arrow), much faster than fiona
+        world = gpd.read_file(path, engine="pyogrio", use_arrow=True)
+    else:
+        world = gpd.read_file(path)
     world.rename(
         columns={
             "ADM0_A3": "country_iso3",
@@ -70,30 +114,111 @@ def load_world_countries(resolution: str = "110m") -> gpd.GeoDataFrame:
         },
         inplace=True,
     )
-    return world[["country_name", "country_iso3", "geometry"]].copy()
+    # column selection already builds a new frame, no need for an extra copy
+    world = world[["country_name", "country_iso3", "geometry"]]
+    world.to_parquet(cache_path)
+    return world
+
+
+def _sjoin_partition(
+    df: gpd.GeoDataFrame,
+    tree: shapely.STRtree,
+    filter_df: gpd.GeoDataFrame,
+    predicate: str,
+) -> gpd.GeoDataFrame:
+    """Inner spatial join of a partition against the geometries indexed in tree.
+
+    Mirrors the output of `gpd.sjoin`: matched left rows, with `index_right` and the
+    non-geometry columns of filter_df appended.
+    """
+    input_idx, tree_idx = tree.query(df.geometry.values, predicate=predicate)
+    order = np.lexsort((tree_idx, input_idx))
+    input_idx, tree_idx = input_idx[order], tree_idx[order]
+    right_columns = {
+        col: filter_df[col].to_numpy()[tree_idx]
+        for col in filter_df.columns
+        if col != filter_df.geometry.name
+    }
+    return df.iloc[input_idx].assign(
+        index_right=filter_df.index.to_numpy()[tree_idx],
+        **right_columns,
+    )
 
 
 class GeoFilterModel:
     def __init__(self, *, filter_df: gpd.GeoDataFrame, method: str) -> None:
         self.filter_df = filter_df
         self.method = method
+        # spatial index over the filter geometries, built once per filter then shared (and
+        # pickled along the filter) by all the requests and partitions it tags. Geometries
+        # are kept per country (not dissolved), as each match carries its tags.
+        self._tree = shapely.STRtree(filter_df.geometry.to_numpy())
 
     def filter_dataset(self, dataset: xr.Dataset) -> xr.Dataset:
-        """Filter a dataset using longitude (the most numerous dimension)."""
+        """Filter a dataset to the bounds of the filter geometries (longitude and latitude)."""
         bounds = self.bounds
-        return dataset.sel(longitude=slice(bounds["min_lon"], bounds["max_lon"]))
+        latitudes = dataset["latitude"].values
+        if latitudes[0] > latitudes[-1]:
+            # ECMWF grids have descending latitudes
+            latitude_slice = slice(bounds["max_lat"], bounds["min_lat"])
+        else:
+            latitude_slice = slice(bounds["min_lat"], bounds["max_lat"])
+        return dataset.sel(
+            longitude=slice(bounds["min_lon"], bounds["max_lon"]),
+            latitude=latitude_slice,
+        )
+
+    @property
+    def tag_columns(self) -> list[str]:
+        """Attribute columns of filter_df used to tag matching points."""
+        return [col for col in self.filter_df.columns if col != self.filter_df.geometry.name]
+
+    def tag_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Index (position in filter_df) of the geometry matching each point, -1 if none.
+
+        A single match is kept where geometries overlap.
+        """
+        input_idx, tree_idx = self._tree.query(shapely.points(xs, ys), predicate=self.method)
+        matches = np.full(np.size(xs), -1, dtype=np.intp)
+        matches[input_idx] = tree_idx
+        return matches
+
+    def tag_dataset(self, dataset: xr.Dataset) -> xr.Dataset:
+        """Tag each (latitude, longitude) cell of a dataset with the matching filter attributes.
+
+        Attributes are added as 2D coordinates (null for cells matching no geometry, a single
+        match kept where geometries overlap), so the spatial test runs once per grid cell
+        instead of once per dataframe row.
+        """
+        lon_grid, lat_grid = np.meshgrid(dataset["longitude"].values, dataset["latitude"].values)
+        matches = self.tag_points(lon_grid.ravel(), lat_grid.ravel())
+        matched = matches >= 0
+        tags = {}
+        for col in self.tag_columns:
+            values = np.full(matches.shape, None, dtype=object)
+            values[matched] = self.filter_df[col].to_numpy()[matches[matched]]
+            tags[col] = (("latitude", "longitude"), values.reshape(lon_grid.shape))
+        return dataset.assign_coords(tags)
 
     def filter_dask(self, ddf: dask_gpd.GeoDataFrame) -> dask_gpd.GeoDataFrame:
         """Filter a dask dataframe based on the filter_df and method.
 
         Also used as a geotagging by assigning the matching iso3 to each row in ddf.
+        filter_df is small, so it is broadcast to every partition along with its spatial
+        index instead of going through a partitioned spatial join.
         """
-        return ddf.sjoin(self.filter_df, predicate=self.method)
+        args = (self._tree, self.filter_df, self.method)
+        return ddf.map_partitions(
+            _sjoin_partition,
+            *args,
+            meta=_sjoin_partition(ddf._meta, *args),
+        )
 
-    @property
+    @cached_property
     def bounds(self) -> dict[str, float]:
-        """Boundaries of the all the geometries in filter_df."""
-        min_lon, min_lat, max_lon, max_lat = shapely.unary_union(self.filter_df.geometry).bounds
+        """Boundaries of the all the geometries in filter_df (computed once per filter)."""
+        # envelope of the individual geometries, same as the union's but without computing it
+        min_lon, min_lat, max_lon, max_lat = map(float, self.filter_df.total_bounds)
         return {
             "min_lon": min_lon,
             "min_lat": min_lat,
@@ -112,19 +237,25 @@ class GeoFilterModel:
             east=bounds["max_lon"],
         )
 
-    def filter_iso3s(self, list_iso3s: list[str]) -> "GeoFilterModel":
+    def filter_iso3s(self, list_iso3s: Collection[str]) -> "GeoFilterModel":
         """Create an instance of GeoFilterModel using a list of iso3s."""
+        mask = self.filter_df["country_iso3"].isin(list_iso3s)
+        # compact copy, so that only the selected countries are shipped along with the filter
         return GeoFilterModel(
-            filter_df=self.filter_df[self.filter_df["country_iso3"].isin(list_iso3s)],
+            filter_df=self.filter_df.loc[mask].reset_index(drop=True),
             method="within",
         )
 
     @classmethod
-    def from_bounding_box(cls, bounding_box: BoundingBox | str) -> "GeoFilterModel":  # noqa: ANN102
+    def from_bounding_box(  # noqa: ANN102
+        cls,
+        bounding_box: BoundingBox | str,
+        resolution: str = WORLD_COUNTRIES_RESOLUTION,
+    ) -> "GeoFilterModel":
         """Load a GeoFilterModel with filter_df limited to the bounding box specified."""
         # 1. filter the df to keep only df.geometry intersecting / within the bounding box
         # 2. clip all the geoemtries to only keep the part withing the bounding box.
-        world = load_world_countries()
+        world = load_world_countries(resolution=resolution)
         # Create a Shapely Polygon from the bounding box
         if isinstance(bounding_box, str):
             bounding_box = BoundingBox.from_str(bounding_box)
@@ -2,12 +2,19 @@ import datetime as dt
 from abc import ABC, abstractmethod, abstractproperty
 from typing import Generator
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from weather_weaver.models.geo import GeoFilterModel
 
 
 class BaseRequest(ABC, BaseModel):
+    # frozen so that cached properties can't go stale
+    model_config = ConfigDict(frozen=True)
+
+    def __hash__(self) -> int:
+        """Hash on file name, which is derived from the request parameters."""
+        return hash(self.file_name)
+
     @abstractproperty
     def file_name(self) -> str:
         """File name based on metadata."""
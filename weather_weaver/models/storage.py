@@ -16,6 +16,10 @@ class StorageInterface(Protocol):
     def is_valid(self, *, path: Path, min_size_bytes: float) -> bool:
         """Check if a file is valid."""
 
+    def snapshot_sizes(self, *, folder: Path, extension: str | None = None) -> dict[str, int]:
+        """Size of each entry of a folder, listed at once."""
+        pass
+
     def list_files_for_request(self, *, requests: list[BaseRequest]) -> list[Path]:
         """List the available files for requests."""
         pass
@@ -1,38 +1,135 @@
+import math
+import os
 import shutil
+import stat
 from pathlib import Path
 
 import dask.dataframe
+import pyarrow as pa
+import pyarrow.parquet as pq
 import structlog
 
-from weather_weaver.constants import MIN_VALID_SIZE_BYTES
+from weather_weaver.constants import (
+    MIN_VALID_SIZE_BYTES,
+    PARQUET_COMPRESSION,
+    PARQUET_COMPRESSION_LEVEL,
+    PARQUET_PAGE_SIZE,
+    PARQUET_ROW_GROUP_SIZE,
+)
 from weather_weaver.models.storage import StorageInterface
 
 logger = structlog.getLogger()
 
 
+def _dir_size(root: str, stop_above: float = math.inf) -> int:
+    """Total size of the files under a directory, walked with a single scandir per folder.
+
+    The walk stops as soon as the total exceeds stop_above (the partial total is returned).
+    """
+    total, stack = 0, [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    total += entry.stat(follow_symlinks=False).st_size
+                    if total > stop_above:
+                        return total
+    return total
+
+
 class LocalClient(StorageInterface):
+    def __init__(
+        self,
+        *,
+        row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+        data_page_size: int = PARQUET_PAGE_SIZE,
+        compression: str = PARQUET_COMPRESSION,
+        compression_level: int | None = PARQUET_COMPRESSION_LEVEL,
+    ) -> None:
+        self.row_group_size = row_group_size
+        self.data_page_size = data_page_size
+        self.compression = compression
+        self.compression_level = compression_level
+
     def exists(self, *, path: Path) -> bool:
         """Check if file exists."""
         return path.exists()
 
     def is_valid(self, *, path: Path, min_size_bytes: float = MIN_VALID_SIZE_BYTES) -> bool:
         """Check if a file is valid."""
-        if self.exists(path=path):
-            if path.is_file():
-                total_size = path.stat().st_size
-            else:
-                total_size = sum(f.stat().st_size for f in path.glob("**/*") if f.is_file())
-            return total_size > min_size_bytes
-        return False
+        # a single stat, instead of checking existence and type separately
+        try:
+            path_stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        if stat.S_ISDIR(path_stat.st_mode):
+            # no need to size the whole directory once the threshold is reached
+            total_size = _dir_size(path, stop_above=min_size_bytes)
+        else:
+            total_size = path_stat.st_size
+        return total_size > min_size_bytes
+
+    def snapshot_sizes(self, *, folder: Path, extension: str | None = None) -> dict[str, int]:
+        """Size of each entry of a folder (total size of the files below for directories).
+
+        Only entries with the given extension are sized, if specified.
+        """
+        suffix = f".{extension}" if extension is not None else ""
+        try:
+            with os.scandir(folder) as entries:
+                # cheap checks first: the name, then the type (both known from the directory
+                # listing), before any stat
+                return {
+                    entry.name: (
+                        _dir_size(entry.path)
+                        if entry.is_dir(follow_symlinks=False)
+                        else entry.stat(follow_symlinks=False).st_size
+                    )
+                    for entry in entries
+                    if entry.name.endswith(suffix)
+                }
+        except FileNotFoundError:
+            return {}
 
     def list_files_for_request(self, *, folder: Path, extension: str = "parquet") -> list[Path]:
         """List the available files."""
-        return folder.glob(f"*.{extension}")
+        # plain suffix comparison on the directory entries, no glob pattern matching
+        suffix = f".{extension}"
+        try:
+            with os.scandir(folder) as entries:
+                return [Path(entry.path) for entry in entries if entry.name.endswith(suffix)]
+        except FileNotFoundError:
+            return []
 
     def store(self, *, ddf: dask.dataframe.DataFrame, destination_path: Path) -> Path:
         """Store a dataset."""
         destination_path.parent.mkdir(parents=True, exist_ok=True)
-        ddf.to_parquet(destination_path, write_index=False)
+        if ddf.npartitions == 1:
+            # a single partition is written directly with pyarrow, skipping the dask graph
+            # (same layout as dask: a directory holding part.0.parquet)
+            destination_path.mkdir(exist_ok=True)
+            pq.write_table(
+                pa.Table.from_pandas(ddf.compute(), preserve_index=False),
+                destination_path / "part.0.parquet",
+                row_group_size=self.row_group_size,
+                data_page_size=self.data_page_size,
+                compression=self.compression,
+                compression_level=self.compression_level,
+            )
+        else:
+            ddf.to_parquet(
+                destination_path,
+                write_index=False,
+                row_group_size=self.row_group_size,
+                data_page_size=self.data_page_size,
+                compression=self.compression,
+                compression_level=self.compression_level,
+                # each partition file carries its own footer, no consolidated _metadata to
+                # gather (and rewrite) across all of them.
+                write_metadata_file=False,
+            )
         logger.debug(
             event="Stored DataFrame",
             destination_path=destination_path,
@@ -41,12 +138,14 @@ class LocalClient(StorageInterface):
 
     def delete(self, *, path: Path) -> None:
         """Delete object by path."""
-        if not path.exists():
-            raise FileNotFoundError(f"file does not exist: {path}")
-        if path.is_file():
+        try:
+            path_stat = os.stat(path)
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"file does not exist: {path}") from e
+        if stat.S_ISREG(path_stat.st_mode):
             path.unlink()
-        elif path.is_dir():
-            shutil.rmtree(path.as_posix())
+        elif stat.S_ISDIR(path_stat.st_mode):
+            shutil.rmtree(path)
         else:
             raise ValueError(f"path is not a file or directory: {path}")
         logger.debug(
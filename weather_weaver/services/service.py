@@ -1,13 +1,19 @@
 import datetime as dt
+import itertools
+import math
 import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import dask
 import dask.dataframe
 import dask_geopandas as dask_gpd
 import structlog
+from distributed import Client
 from pandas.tseries.offsets import DateOffset
 
+from weather_weaver.constants import MIN_VALID_SIZE_BYTES
 from weather_weaver.models.fetcher import FetcherInterface
 from weather_weaver.models.processor import BaseProcessor
 from weather_weaver.models.request import BaseRequest, BaseRequestBuilder
@@ -17,7 +23,12 @@ from weather_weaver.utils import OffsetFrequency
 dask.config.set({"array.slicing.split_large_chunks": True})
 logger = structlog.getLogger()
 
-MAX_THREADS = 4
+# max number of tasks the requests are batched into
+MAX_BATCHES = 32
+# max number of raw files downloaded concurrently within a batch
+MAX_CONCURRENT_DOWNLOADS = 4
+# worker resource (if declared by the cluster workers) each batch task requires
+PROCESSING_RESOURCE = "processing"
 
 
 class WeatherConsumerService:
@@ -35,6 +46,7 @@ class WeatherConsumerService:
         processor: BaseProcessor,
         storer: StorageInterface,
         processed_dir: Path,
+        client: Client | None = None,
     ) -> None:
         self.request_builder = request_builder
         self.raw_dir = raw_dir
@@ -42,6 +54,11 @@ class WeatherConsumerService:
         self.processor = processor
         self.storer = storer
         self.processed_dir = processed_dir
+        self.client = client
+
+    def __getstate__(self) -> dict:
+        """Pickle the service without its client, which stays on the driver."""
+        return {**self.__dict__, "client": None}
 
     @staticmethod
     def _date_offset(offset_frequency: OffsetFrequency, offset: int) -> DateOffset:
@@ -58,8 +75,8 @@ class WeatherConsumerService:
         start: dt.date,
         date_offset: int,
         offset_frequency: OffsetFrequency,
-    ) -> list[BaseRequest]:
-        all_run_dates: list[dt.datetime] = [
+    ) -> Iterator[BaseRequest]:
+        all_run_dates: Iterator[dt.date] = (
             (
                 start
                 + self._date_offset(
@@ -70,22 +87,37 @@ class WeatherConsumerService:
             .to_pydatetime()
             .date()
             for i in range(date_offset)
-        ]
-        all_requests: list[list[BaseRequest]] = [
+        )
+        # requests of all run dates, built lazily (never all held in memory at once)
+        return itertools.chain.from_iterable(
             self.request_builder.build_default_requests(run_date=run_date)
             for run_date in all_run_dates
-        ]
-        # flatten and return list
-        return [u for v in all_requests for u in v]
-
-    def _filter_new_requests(self, all_requests: list[BaseRequest]) -> list[BaseRequest]:
-        return [
-            t
-            for t in all_requests
-            if not self.storer.is_valid(
-                path=self.processed_dir / f"{t.file_name}.parquet",
-            )
-        ]
+        )
+
+    def _filter_new_requests(self, all_requests: Iterable[BaseRequest]) -> list[BaseRequest]:
+        # a single listing per folder of processed files (file names may contain sub-folders),
+        # instead of checking them one by one
+        sizes_by_folder: dict[Path, dict[str, int]] = {}
+        new_requests = []
+        count_all_requests = 0
+        for t in all_requests:
+            count_all_requests += 1
+            processed_path = self.processed_dir / f"{t.file_name}.parquet"
+            folder = processed_path.parent
+            if folder not in sizes_by_folder:
+                sizes_by_folder[folder] = self.storer.snapshot_sizes(
+                    folder=folder,
+                    extension="parquet",
+                )
+            if sizes_by_folder[folder].get(processed_path.name, 0) <= MIN_VALID_SIZE_BYTES:
+                new_requests.append(t)
+
+        logger.debug(
+            event="Built requests.",
+            count_new_requests=len(new_requests),
+            count_all_requests=count_all_requests,
+        )
+        return new_requests
 
     def _download(self, request: BaseRequest) -> tuple[Path | None, BaseRequest]:
         raw_path = self.fetcher.download_raw_file(
@@ -115,41 +147,51 @@ class WeatherConsumerService:
             destination_path=self.processed_dir / f"{file_name}.parquet",
         )
 
-    def _build_dask_pipeline(
-        self,
-        all_new_requests: list[BaseRequest],
-        npartitions: int,
-    ) -> dask.bag.Bag:
-        dask_bag = (
-            dask.bag.from_sequence(seq=all_new_requests, npartitions=npartitions)
-            .map(self._download)
-            # filter out failed downloads
-            .filter(lambda raw_path_request: raw_path_request[0] is not None)
-            .map(self._process)
-            .map(self._store)
-        )
-        return dask_bag
+    def _run_batch(self, requests: list[BaseRequest]) -> list[Path | None]:
+        # producer/consumer: downloads run ahead in background threads, while each raw
+        # file is processed and stored (in order) as soon as it is available.
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS) as executor:
+            return [
+                # failed downloads are not processed
+                None if raw_path is None else self._store(self._process((raw_path, request)))
+                for raw_path, request in executor.map(self._download, requests)
+            ]
+
+    def _has_processing_resource(self) -> bool:
+        """Whether workers of the cluster declare the processing resource."""
+        workers = self.client.scheduler_info()["workers"].values()
+        return any(PROCESSING_RESOURCE in w.get("resources", {}) for w in workers)
 
     def _process_requests(
         self,
         all_new_requests: list[BaseRequest],
         dask_scheduler: str | None = None,
     ) -> list[Path]:
-        # TODO: do we need an orchestrator here instead?
-        # define the pipeline
-        pipeline = (
-            self._build_dask_pipeline(
-                all_new_requests,
-                npartitions=len(all_new_requests),
-            )
-            if len(all_new_requests) > 0
-            else None
-        )
-        # run the pipeline
-        processed_files: list[Path] = (
-            pipeline.compute(scheduler=dask_scheduler) if pipeline is not None else []
-        )
-        return processed_files
+        # tasks chaining download, processing and storage of a batch of requests, all
+        # submitted at once: the (I/O bound) downloads of some requests overlap with the
+        # processing of others, instead of waiting for all the downloads to complete.
+        # requests are batched to bound the number of tasks (and their overhead).
+        batch_size = max(1, math.ceil(len(all_new_requests) / MAX_BATCHES))
+        batches = [
+            all_new_requests[i : i + batch_size]
+            for i in range(0, len(all_new_requests), batch_size)
+        ]
+        service = self
+        annotations = {}
+        if self.client is not None and all_new_requests:
+            # send the service (fetcher, processor and geo filter included) once to every
+            # worker of the cluster, tasks then reference it by key instead of pickling it.
+            service = self.client.scatter(self, broadcast=True)
+            if self._has_processing_resource():
+                # bound the number of batches (and processed frames) held by each worker
+                annotations["resources"] = {PROCESSING_RESOURCE: 1}
+        with dask.annotate(**annotations):
+            tasks = [
+                dask.delayed(WeatherConsumerService._run_batch, pure=False)(service, batch)
+                for batch in batches
+            ]
+        processed_batches = dask.compute(*tasks, scheduler=dask_scheduler)
+        return [path for batch in processed_batches for path in batch if path is not None]
 
     def download_datasets(
         self,
@@ -175,12 +217,6 @@ class WeatherConsumerService:
         # check the ones already processed
         all_new_requests = self._filter_new_requests(all_requests)
 
-        logger.debug(
-            event="Built requests.",
-            count_new_requests=len(all_new_requests),
-            count_all_requests=len(all_requests),
-        )
-
         processed_files = self._process_requests(all_new_requests, dask_scheduler=scheduler)
 
         end_time = time.perf_counter()